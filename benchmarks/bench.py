@@ -0,0 +1,226 @@
+"""
+Throughput benchmarks for the engine, agents and multi-table runner.
+
+    python -m benchmarks.bench                       # run everything
+    python -m benchmarks.bench --only engine_local   # one scenario
+    python -m benchmarks.bench --save base.json      # write a baseline
+    python -m benchmarks.bench --compare base.json   # compare against it
+
+Each scenario reports units/s (rounds, calls or draws), its per-phase wall
+time, and the peak Python heap measured with tracemalloc in a second pass.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Callable, Dict, Tuple
+
+from src.models.card import CARDS
+from src.models.deck import Deck
+from src.models.hand import Hand
+from src.models.dealer import Dealer
+from src.agents.player_agent import PlayerAgent
+from src.agents.basic_player_agent import BasicPlayerAgent
+from src.game.game_engine import GameEngine
+from src.game.simulation_runner import SimulationRunner
+
+# Scenario result: (units processed, seconds per phase)
+Result = Tuple[int, Dict[str, float]]
+
+class StubLLMClient:
+    """In-process stand-in for LLMClient that answers instantly"""
+    def __init__(self):
+        self.calls = 0
+    
+    def create(self, **kwargs):
+        self.calls += 1
+        content = "S" if kwargs.get("max_tokens") == 1 else "50"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+def make_local_players():
+    return [BasicPlayerAgent("Basic 1"), BasicPlayerAgent("Basic 2"), BasicPlayerAgent("Basic 3")]
+
+def _play_rounds(game: GameEngine, num_rounds: int) -> Dict[str, float]:
+    deal = play = 0.0
+    for _ in range(num_rounds):
+        # Keep the seats funded so every round exercises the full path, and
+        # reset runaway winners before their percentage bets overflow a float
+        for player in game.players:
+            if player.chips < 100 or player.chips > 1_000_000:
+                player.chips = 1000
+        start = time.perf_counter()
+        game.start_round()
+        middle = time.perf_counter()
+        game.play_round()
+        play += time.perf_counter() - middle
+        deal += middle - start
+    return {"start_round": deal, "play_round": play}
+
+def bench_hand_get_value(size: int) -> Result:
+    hands = []
+    rng = random.Random(0)
+    for _ in range(1000):
+        hand = Hand()
+        for _ in range(rng.randint(2, 5)):
+            hand.add_card(CARDS[rng.randrange(52)])
+        hands.append(hand)
+    start = time.perf_counter()
+    for _ in range(size // 1000):
+        for hand in hands:
+            hand.get_value()
+    return size, {"get_value": time.perf_counter() - start}
+
+def bench_deck_draw_shuffle(size: int) -> Result:
+    deck = Deck(rng=random.Random(0), num_decks=6)
+    draw = shuffle = 0.0
+    drawn = 0
+    while drawn < size:
+        start = time.perf_counter()
+        deck.reshuffle()
+        middle = time.perf_counter()
+        for _ in range(len(deck)):
+            deck.draw_card()
+        draw += time.perf_counter() - middle
+        shuffle += middle - start
+        drawn += 312
+    return drawn, {"reshuffle": shuffle, "draw_card": draw}
+
+def bench_player_decide_action(size: int) -> Result:
+    agent = PlayerAgent()
+    rng = random.Random(0)
+    states = []
+    for _ in range(1000):
+        hand = Hand()
+        for _ in range(2):
+            hand.add_card(CARDS[rng.randrange(52)])
+        states.append((hand, CARDS[rng.randrange(52)]))
+    start = time.perf_counter()
+    for _ in range(size // 1000):
+        for hand, up_card in states:
+            agent.hand = hand
+            agent.decide_action(up_card)
+    return size, {"decide_action": time.perf_counter() - start}
+
+def bench_engine_local(size: int) -> Result:
+    game = GameEngine(rng=random.Random(0), dealer=Dealer(), num_decks=6)
+    for player in make_local_players():
+        game.add_player(player)
+    return size, _play_rounds(game, size)
+
+def _make_llm_table(client) -> GameEngine:
+    # Imported here so local-only scenarios never need the LLM agents
+    from src.agents.gpt_player_agent import GPTPlayerAgent
+    from src.agents.dealer_agent import DealerAgent
+    game = GameEngine(rng=random.Random(0), dealer=DealerAgent(client=client), num_decks=6)
+    game.add_player(BasicPlayerAgent("Basic"))
+    game.add_player(GPTPlayerAgent("Conservative", style="conservative", client=client))
+    game.add_player(GPTPlayerAgent("Aggressive", style="aggressive", client=client))
+    return game
+
+def bench_engine_replay_llm(size: int) -> Result:
+    # Records the stub table once, then times the same table answered from the recording
+    from src.agents.llm_replay import CallStore, RecordingClient, ReplayClient
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CallStore(os.path.join(tmp, "calls.db"))
+        _play_rounds(_make_llm_table(RecordingClient(StubLLMClient(), store)), size)
+        replay = ReplayClient(store)
+        store.close()
+    phases = _play_rounds(_make_llm_table(replay), size)
+    if replay.misses:
+        raise RuntimeError(f"{replay.misses} requests missing from the recording")
+    return size, phases
+
+def bench_engine_stub_llm(size: int) -> Result:
+    return size, _play_rounds(_make_llm_table(StubLLMClient()), size)
+
+def bench_runner(size: int) -> Result:
+    runner = SimulationRunner(make_local_players, seed=0, use_ai_dealer=False)
+    start = time.perf_counter()
+    runner.run(size)
+    return size, {"run": time.perf_counter() - start}
+
+# name -> (function, default size, unit)
+SCENARIOS: Dict[str, Tuple[Callable[[int], Result], int, str]] = {
+    "hand_get_value": (bench_hand_get_value, 1_000_000, "calls"),
+    "deck_draw_shuffle": (bench_deck_draw_shuffle, 500_000, "cards"),
+    "player_decide_action": (bench_player_decide_action, 500_000, "calls"),
+    "engine_local": (bench_engine_local, 50_000, "rounds"),
+    "engine_stub_llm": (bench_engine_stub_llm, 20_000, "rounds"),
+    "engine_replay_llm": (bench_engine_replay_llm, 5_000, "rounds"),
+    "runner": (bench_runner, 100_000, "rounds"),
+}
+
+def run_scenario(name: str, scale: float = 1.0) -> Dict:
+    func, size, unit = SCENARIOS[name]
+    size = max(1000, int(size * scale))
+    
+    start = time.perf_counter()
+    units, phases = func(size)
+    elapsed = time.perf_counter() - start
+    
+    # Separate pass for memory, tracemalloc slows the timed pass down
+    tracemalloc.start()
+    func(max(1000, size // 10))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return {
+        "unit": unit,
+        "units": units,
+        "seconds": elapsed,
+        "per_second": units / elapsed,
+        "phases": phases,
+        "peak_bytes": peak,
+    }
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float):
+    """Print throughput ratios against a baseline and flag regressions"""
+    print("\n=== Comparison with baseline ===")
+    regressions = 0
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["per_second"] / baseline[name]["per_second"]
+        flag = ""
+        if ratio < 1 - threshold:
+            flag = "  <-- regression"
+            regressions += 1
+        print(f"{name:22s} {ratio:6.2f}x{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="21point throughput benchmarks")
+    parser.add_argument("--only", nargs="*", choices=sorted(SCENARIOS), help="scenarios to run")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every scenario size")
+    parser.add_argument("--save", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="compare with a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="slowdown fraction reported as a regression")
+    args = parser.parse_args()
+    
+    results = {}
+    for name in args.only or SCENARIOS:
+        result = results[name] = run_scenario(name, args.scale)
+        phases = ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in result["phases"].items())
+        print(f"{name:22s} {result['per_second']:12,.0f} {result['unit']}/s  "
+              f"peak {result['peak_bytes'] / 1024:8.1f} KiB  [{phases}]")
+    
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": platform.python_version(), "results": results}, f, indent=2)
+        print(f"\nBaseline saved to {args.save}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
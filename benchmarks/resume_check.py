@@ -0,0 +1,103 @@
+"""
+Kill-and-resume check for play_shard snapshots.
+
+    python -m benchmarks.resume_check
+    python -m benchmarks.resume_check --rounds 50000 --kills 5
+
+Plays one table straight through, then plays the same table in a child
+process that is killed (SIGKILL) right after a snapshot, several times, and
+finishes it in this process from the last snapshot. Fails unless the stats
+and the event log are byte-identical to the uninterrupted run and the dealer
+shadow counts and tracer counts match it.
+"""
+import argparse
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from src.agents.basic_player_agent import BasicPlayerAgent
+from src.agents.dealer_agent import DealerAgent
+from src.game.checkpoint import load_snapshot
+from src.game.simulation_runner import play_shard
+
+SEED = 11
+SNAPSHOT_EVERY = 100
+
+class AlwaysHitClient:
+    """Shadow-check client that always answers hit, so disagreements are deterministic"""
+    def create(self, **kwargs):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="H"))])
+
+def make_players():
+    return [BasicPlayerAgent("Basic 1"), BasicPlayerAgent("Basic 2"), BasicPlayerAgent("Basic 3")]
+
+def make_dealer():
+    return DealerAgent(mode="rule", shadow_rate=0.25, seed=SEED, client=AlwaysHitClient())
+
+def play(num_rounds: int, event_log: str, snapshot=None) -> dict:
+    return play_shard(0, 0, num_rounds, SEED, make_players, make_dealer=make_dealer, trace=True,
+                      num_decks=6, event_log=event_log, snapshot=snapshot, snapshot_every=SNAPSHOT_EVERY)
+
+def fingerprint(result: dict, event_log: str) -> dict:
+    """The parts of a result an interrupted run must reproduce"""
+    trace = result["trace"]
+    with open(event_log, "rb") as f:
+        events = f.read()
+    return {
+        "stats": pickle.dumps(result["stats"]),
+        "events": events,
+        "final_chips": result["final_chips"],
+        "dealer_chips": result["dealer_chips"],
+        "dealer_shadow": result["dealer_shadow"],
+        "trace_counts": {name: histogram.count
+                         for name, histogram in list(trace.phases.items()) + list(trace.decisions.items())},
+        "trace_counters": trace.counters,
+    }
+
+def _kill_after(num_rounds: int, event_log: str, snapshot: str, rounds_done: int) -> int:
+    """Run the table in a child process and kill it once a snapshot covers rounds_done rounds"""
+    code = (f"from benchmarks.resume_check import play; "
+            f"play({num_rounds}, {event_log!r}, {snapshot!r})")
+    child = subprocess.Popen([sys.executable, "-c", code])
+    try:
+        while child.poll() is None:
+            saved = load_snapshot(snapshot)
+            if saved is not None and saved.get("rounds_done", num_rounds) >= rounds_done:
+                break
+            time.sleep(0.001)
+    finally:
+        child.kill()
+        child.wait()
+    saved = load_snapshot(snapshot)
+    return num_rounds if saved is None or "result" in saved else saved["rounds_done"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that a killed play_shard resumes to the same result")
+    parser.add_argument("--rounds", type=int, default=20_000)
+    parser.add_argument("--kills", type=int, default=3, help="times to kill the table before finishing it")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        straight_log = os.path.join(tmp, "straight.bin")
+        expected = fingerprint(play(args.rounds, straight_log), straight_log)
+
+        resumed_log = os.path.join(tmp, "resumed.bin")
+        snapshot = os.path.join(tmp, "table.snap")
+        for kill in range(1, args.kills + 1):
+            rounds_done = _kill_after(args.rounds, resumed_log, snapshot, args.rounds * kill // (args.kills + 1))
+            print(f"Kill {kill}: snapshot at round {rounds_done}/{args.rounds}")
+        resumed = fingerprint(play(args.rounds, resumed_log, snapshot), resumed_log)
+
+    mismatched = [name for name in expected if resumed[name] != expected[name]]
+    if mismatched:
+        print(f"FAIL: resumed run differs in {', '.join(mismatched)}")
+        sys.exit(1)
+    print(f"OK: {args.rounds} rounds, shadow {expected['dealer_shadow']['samples']} samples, "
+          f"identical after {args.kills} kills")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Startup guard for local-only simulations.
+
+    python -m benchmarks.startup_check                 # check and report
+    python -m benchmarks.startup_check --budget 0.5    # also fail above 0.5 s
+
+Runs a fresh interpreter the way a worker process starts: import main, build
+local players and a rule-mode dealer, play a few rounds. Fails if openai,
+matplotlib or numpy got loaded along the way, or if startup exceeds the budget.
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+# Modules that only LLM agents, plots and the vectorized engines may pull in
+HEAVY_MODULES = ("openai", "matplotlib", "httpx", "numpy")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+from src.agents.basic_player_agent import BasicPlayerAgent
+from src.agents.dealer_agent import DealerAgent
+from src.game.game_engine import GameEngine
+imported = time.perf_counter()
+game = GameEngine(dealer=DealerAgent(mode="rule"))
+for i in range(3):
+    game.add_player(BasicPlayerAgent(f"Basic {i}"))
+for _ in range(10):
+    game.start_round()
+    game.play_round()
+print(json.dumps({
+    "import_s": imported - start,
+    "total_s": time.perf_counter() - start,
+    "loaded": sorted({name.split(".")[0] for name in sys.modules} & set(%r)),
+}))
+"""
+
+def probe() -> dict:
+    """Run the probe in a fresh interpreter and return its report"""
+    output = subprocess.run([sys.executable, "-c", _PROBE % (HEAVY_MODULES,)],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that local runs don't load LLM or plotting libraries")
+    parser.add_argument("--budget", type=float, help="maximum seconds from interpreter start to 10 rounds played")
+    args = parser.parse_args()
+
+    report = probe()
+    print(f"imports: {report['import_s'] * 1000:.1f} ms, "
+          f"imports + 10 rounds: {report['total_s'] * 1000:.1f} ms")
+    failed = False
+    if report["loaded"]:
+        print(f"FAIL: local-only run loaded {', '.join(report['loaded'])}")
+        failed = True
+    if args.budget is not None and report["total_s"] > args.budget:
+        print(f"FAIL: startup took {report['total_s']:.3f}s, budget {args.budget:.3f}s")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Headless simulation runner driven by a JSON config file.
+
+    python cli.py run.json                          # run as configured
+    python cli.py run.json --resume                 # continue from the last checkpoint
+    python cli.py run.json --set seed=7 --set output.dir=\"runs/seed7\"
+
+Any config key can be overridden with --set key=value (dotted keys reach
+into sections, values are parsed as JSON when possible), so strategy sweeps
+don't need a config file per point. See src/game/run_config.py for the keys
+and their defaults.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+from src.game.run_config import RunConfig
+from src.game.checkpoint import ShardCheckpoint
+from src.game.game_stats import GameStats
+from src.game.simulation_runner import SimulationRunner
+from src.game.stats_aggregator import StatsAggregator
+
+def parse_overrides(pairs: List[str]) -> Dict[str, Any]:
+    """Turn ["a.b=1", "c=x"] into {"a": {"b": 1}, "c": "x"}"""
+    overrides: Dict[str, Any] = {}
+    for pair in pairs:
+        key, sep, raw = pair.partition("=")
+        if not sep:
+            raise ValueError(f"Expected key=value, got: {pair}")
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            value = raw
+        section = overrides
+        *parents, leaf = key.split(".")
+        for parent in parents:
+            section = section.setdefault(parent, {})
+        section[leaf] = value
+    return overrides
+
+def _deep_update(target: Dict[str, Any], updates: Dict[str, Any]):
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_update(target[key], value)
+        else:
+            target[key] = value
+
+class Progress:
+    """
+    Prints finished tables and rounds played, throughput and ETA to stderr:
+    on every finished table, and at most every interval seconds while
+    tables report rounds played so far
+    """
+    def __init__(self, total_rounds: int, total_tables: int, done_rounds: int = 0, done_tables: int = 0,
+                 interval: float = 5.0):
+        self.total_rounds = total_rounds
+        self.total_tables = total_tables
+        self.done_rounds = done_rounds  # Rounds of finished tables
+        self.done_tables = done_tables
+        self.interval = interval
+        self._playing: Dict[int, int] = {}  # Rounds played so far per unfinished table
+        self._resumed_rounds = done_rounds
+        self._start = self._last_print = time.monotonic()
+    
+    def advance(self, shard_id: int, rounds_done: int):
+        """A table still playing has played rounds_done rounds"""
+        self._playing[shard_id] = rounds_done
+        if time.monotonic() - self._last_print >= self.interval:
+            self._print()
+    
+    def update(self, shard_id: int, num_rounds: int):
+        """A table finished its num_rounds rounds"""
+        self._playing.pop(shard_id, None)
+        self.done_rounds += num_rounds
+        self.done_tables += 1
+        self._print()
+    
+    def _print(self):
+        now = self._last_print = time.monotonic()
+        played = self.done_rounds + sum(self._playing.values())
+        elapsed = now - self._start
+        rate = (played - self._resumed_rounds) / elapsed if elapsed else 0.0
+        remaining = (self.total_rounds - played) / rate if rate else float("nan")
+        print(f"[{self.done_tables}/{self.total_tables} tables] "
+              f"{played}/{self.total_rounds} rounds, {rate:,.0f} rounds/s, "
+              f"ETA {remaining:,.0f}s", file=sys.stderr, flush=True)
+
+def write_summary(config: RunConfig, results: List[Dict], path: str):
+    stats = StatsAggregator(config["max_samples"])
+    for result in results:
+        stats.merge(result["stats"])
+    summary = {
+        "fingerprint": config.fingerprint(),
+        "config": config.settings,
+        "players": stats.summary(),
+        "tables": [
+            {
+                "shard_id": result["shard_id"],
+                "final_chips": result["final_chips"],
+                "dealer_chips": result["dealer_chips"],
+                "dealer_shadow": result.get("dealer_shadow"),
+            }
+            for result in results
+        ],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run blackjack simulations from a config file")
+    parser.add_argument("config", help="JSON run config")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="override a config value, e.g. rounds=1000000 or dealer.type=\"rule\"")
+    parser.add_argument("--resume", action="store_true", help="continue from the run's checkpoint")
+    args = parser.parse_args(argv)
+    
+    with open(args.config, encoding="utf-8") as f:
+        settings = json.load(f)
+    _deep_update(settings, parse_overrides(args.set))
+    config = RunConfig(settings)
+    output = config["output"]
+    os.makedirs(output["dir"], exist_ok=True)
+    
+    event_log_dir = None
+    if output["event_log"]:
+        event_log_dir = config.output_path("events")
+        os.makedirs(event_log_dir, exist_ok=True)
+    checkpoint_dir = config.output_path("checkpoint")
+    snapshot_dir = checkpoint_dir if config["checkpoint"] and config["snapshot_every"] else None
+    runner = SimulationRunner(config.make_players(), num_workers=config["workers"], seed=config["seed"],
+                              make_dealer=config.make_dealer(), num_decks=config["num_decks"],
+                              penetration=config["penetration"], event_log_dir=event_log_dir,
+                              snapshot_dir=snapshot_dir, snapshot_every=config["snapshot_every"],
+                              progress_every=config["progress_every"])
+    plan = runner.plan(config["rounds"], config["tables"])
+    rounds_by_shard = {shard_id: num_rounds for shard_id, _, num_rounds in plan}
+    
+    checkpoint = None
+    results: List[Dict] = []
+    if config["checkpoint"]:
+        checkpoint = ShardCheckpoint(checkpoint_dir, config.fingerprint())
+        results = checkpoint.start(resume=args.resume)
+    elif args.resume:
+        parser.error("--resume needs checkpoint enabled in the config")
+    done = {result["shard_id"] for result in results}
+    
+    progress = Progress(config["rounds"], len(plan),
+                        done_rounds=sum(rounds_by_shard[shard_id] for shard_id in done),
+                        done_tables=len(done))
+    print(f"Running {config['rounds']} rounds on {len(plan)} tables with {config['workers']} workers"
+          + (f", {len(done)} tables restored from checkpoint" if done else ""), file=sys.stderr)
+    
+    def on_result(result: Dict):
+        if checkpoint is not None:
+            checkpoint.save(result)
+        progress.update(result["shard_id"], rounds_by_shard[result["shard_id"]])
+    
+    results += runner.run(config["rounds"], config["tables"], skip=done, on_result=on_result,
+                          on_progress=progress.advance if config["progress_every"] else None)
+    results.sort(key=lambda result: result["shard_id"])
+    
+    if output["summary"]:
+        write_summary(config, results, config.output_path("summary.json"))
+        print(f"Summary written to {config.output_path('summary.json')}", file=sys.stderr)
+    if output["plot"]:
+        game_stats = GameStats(config["max_samples"])
+        for result in results:
+            game_stats.merge_shard(result)
+        game_stats.plot_chips_history(config.output_path("chips_history.png"))
+    
+    missing = len(plan) - len(results)
+    if missing:
+        print(f"{missing} tables failed; rerun with --resume to retry them", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,126 +1,147 @@
-from src.game.game_engine import GameEngine
+import os
+import shutil
+from src.game.simulation_runner import SimulationRunner
+from src.game.game_stats import GameStats, plot_phase_timings
+from src.game.tracer import PhaseTracer
 from src.agents.basic_player_agent import BasicPlayerAgent
-from src.agents.gpt_player_agent import GPTPlayerAgent
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
-import matplotlib.pyplot as plt
-import time
-import numpy as np
+# GPT agents (openai) and matplotlib are imported where they are used, so
+# worker processes that only unpickle create_players don't pay for plotting
 
-class GameStats:
-    def __init__(self, total_rounds: int):
-        self.lock = Lock()
-        self.total_rounds = total_rounds
-        self.chips_history = {}  # Record chips history for each player
-        
-    def update_chips(self, player_name: str, chips: int, round_num: int):
-        with self.lock:
-            if player_name not in self.chips_history:
-                self.chips_history[player_name] = [None] * self.total_rounds
-            self.chips_history[player_name][round_num] = chips
-            
-    def plot_chips_history(self):
-        plt.figure(figsize=(15, 10))
-        
-        # Plot chips history for each player
-        for name, history in self.chips_history.items():
-            valid_data = [h for h in history if h is not None]
-            plt.plot(range(len(valid_data)), valid_data, label=name, marker='o')
-        
-        plt.title('Player Chips History')
-        plt.xlabel('Round Number')
-        plt.ylabel('Chips')
-        plt.legend()
-        plt.grid(True)
-        plt.savefig('chips_history.png')
-        plt.close()
+# LLM request budget for each worker process, shared by all of its agents
+REQUESTS_PER_SECOND = 5
+MAX_CONCURRENT_REQUESTS = 4
+# The dealer follows its fixed rule locally; this fraction is checked against GPT
+DEALER_SHADOW_RATE = 0.1
+# Time every round phase and decision, off by default to keep the hot path lean
+TRACE_PHASES = False
+# Tables snapshot their state here; rerunning after a crash resumes from it
+SNAPSHOT_DIR = "checkpoints"
+SNAPSHOT_EVERY = 10  # Rounds between snapshots
+# Compare the agents on identical deals (one seat each) instead of sharing a table
+DUPLICATE_DEAL = False
+# Record every LLM call to this file, or answer from a recording offline instead
+# of calling the API; replayed answers wait "none", "recorded" or "sampled" latency
+LLM_RECORD = None
+LLM_REPLAY = None
+LLM_REPLAY_LATENCY = "none"
 
-def play_game_thread(thread_id: int, start_round: int, num_rounds: int, stats: GameStats):
-    # Create game instance
-    game = GameEngine()
+def print_token_usage(counters: dict):
+    """Per-call prompt and completion tokens of each LLM agent type, from tracer counters"""
+    from src.agents.llm_client import per_call_tokens
+    fields = ("responses", "prompt_tokens", "cached_tokens", "completion_tokens")
+    for agent_type in sorted({name.split(".")[0] for name in counters}):
+        if not counters.get(f"{agent_type}.responses"):
+            continue
+        tokens = per_call_tokens({field: counters[f"{agent_type}.{field}"] for field in fields})
+        print(f"{agent_type}: {tokens['prompt_tokens_per_call']:.0f} prompt tokens/call "
+              f"({tokens['cached_share']:.0%} cached), "
+              f"{tokens['completion_tokens_per_call']:.1f} completion tokens/call")
+
+def configure_client():
+    """This worker's shared LLM client, with the request budget and record/replay settings above"""
+    from src.agents.gpt_player_agent import API_BASE_URL, API_KEY
+    from src.agents.llm_client import get_client
+    return get_client(API_BASE_URL, API_KEY, requests_per_second=REQUESTS_PER_SECOND,
+                      burst=MAX_CONCURRENT_REQUESTS, max_concurrency=MAX_CONCURRENT_REQUESTS,
+                      record=LLM_RECORD, replay=LLM_REPLAY, replay_latency=LLM_REPLAY_LATENCY)
+
+def create_players():
+    from src.agents.gpt_player_agent import GPTPlayerAgent
+    client = configure_client()
     
     # Create 3 players with different styles
-    players = [
+    return [
         BasicPlayerAgent("Basic Strategy Player"),
-        GPTPlayerAgent("Conservative AI Player", style="conservative"),
-        GPTPlayerAgent("Aggressive AI Player", style="aggressive")
+        GPTPlayerAgent("Conservative AI Player", style="conservative", client=client),
+        GPTPlayerAgent("Aggressive AI Player", style="aggressive", client=client)
     ]
+
+def create_dealer():
+    from src.agents.dealer_agent import DealerAgent
+    return DealerAgent(mode="rule", shadow_rate=DEALER_SHADOW_RATE, client=configure_client())
+
+def compare_agents(num_rounds: int, num_workers: int, seed: int):
+    from src.game.duplicate import run_duplicate
     
-    # Add players to game
-    for player in players:
-        game.add_player(player)
-    
-    # Record initial chips
-    for player in players:
-        stats.update_chips(player.name, player.chips, start_round)
-    stats.update_chips("Dealer", game.dealer.chips, start_round)
-    
-    # Play specified number of rounds
-    for round_num in range(num_rounds):
-        global_round = start_round + round_num
-        
-        # Start new round
-        game.start_round()
-        
-        # Play round and get results
-        results = game.play_round(verbose=False)
-        
-        # Record chips for each player
-        for player in players:
-            stats.update_chips(player.name, player.chips, global_round)
-        stats.update_chips("Dealer", game.dealer.chips, global_round)
-        
-        time.sleep(0.05)  # Avoid too frequent API calls
+    print(f"Comparing agents over {num_rounds} duplicate-deal rounds...")
+    report = run_duplicate(create_players, num_rounds, seed=seed, num_shards=num_workers, num_workers=num_workers)
     
-    return {player.name: player.chips for player in players}, game.dealer.chips
+    print("\n=== Per-Round Chips (each agent on the same cards) ===")
+    for name, summary in report["agents"].items():
+        print(f"{name}: {summary['mean']:+.2f} [{summary['ci_low']:+.2f}, {summary['ci_high']:+.2f}]")
+    print("\n=== Paired Differences (95% CI) ===")
+    for (a, b), summary in report["pairs"].items():
+        print(f"{a} - {b}: {summary['mean']:+.2f} [{summary['ci_low']:+.2f}, {summary['ci_high']:+.2f}] "
+              f"(stderr {summary['stderr']:.2f}, unpaired would be {summary.get('unpaired_stderr', 0.0):.2f})")
 
 def main():
     # Configuration parameters
-    num_threads = 4  # Number of threads
+    num_workers = 4  # Number of worker processes
     total_rounds = 40  # Total rounds
-    rounds_per_thread = total_rounds // num_threads
+    seed = 0  # Run seed, each worker derives its own stream from it
+    
+    if DUPLICATE_DEAL:
+        compare_agents(total_rounds, num_workers, seed)
+        return
     
     # Initialize statistics
-    stats = GameStats(total_rounds)
+    stats = GameStats()
     
-    print(f"Starting {total_rounds} rounds of games using {num_threads} threads...")
+    print(f"Starting {total_rounds} rounds of games using {num_workers} worker processes...")
     print("Each game includes 3 players (Basic Strategy, Conservative AI, Aggressive AI)")
     print("Initial chips: Players 1000, Dealer 5000")
     
-    # Use thread pool to run games
-    with ThreadPoolExecutor(max_workers=num_threads) as executor:
-        futures = [
-            executor.submit(
-                play_game_thread, 
-                i, 
-                i * rounds_per_thread,  # Start round
-                rounds_per_thread, 
-                stats
-            )
-            for i in range(num_threads)
-        ]
-        
-        # Collect results
-        final_results = []
-        for future in as_completed(futures):
-            try:
-                player_chips, dealer_chips = future.result()
-                final_results.append((player_chips, dealer_chips))
-            except Exception as e:
-                print(f"Thread execution error: {e}")
+    # Use process pool to run games, API calls are throttled by the shared client
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    runner = SimulationRunner(create_players, num_workers=num_workers, seed=seed,
+                              make_dealer=create_dealer, trace=TRACE_PHASES,
+                              snapshot_dir=SNAPSHOT_DIR, snapshot_every=SNAPSHOT_EVERY)
+    tracer = PhaseTracer()
+    final_results = []
+    for result in runner.run(total_rounds):
+        stats.merge_shard(result)
+        if "trace" in result:
+            tracer.merge(result["trace"])
+        final_results.append((result["final_chips"], result["dealer_chips"], result.get("dealer_shadow")))
+    
+    if len(final_results) == runner.num_workers:
+        # Every table finished, the next run starts fresh
+        shutil.rmtree(SNAPSHOT_DIR)
     
     # Plot chips history
     stats.plot_chips_history()
     print("\nChips history chart has been saved as chips_history.png")
     
+    if TRACE_PHASES:
+        plot_phase_timings(tracer)
+        print("Phase timing chart has been saved as phase_timings.png")
+        trace = tracer.summary()
+        print("\n=== Phase Timings ===")
+        for name, timing in list(trace["phases"].items()) + list(trace["decisions"].items()):
+            print(f"{name}: {timing['count']} x {timing['mean_us']:.1f}us "
+                  f"(max {timing['max_us']:.1f}us, total {timing['total_s']:.3f}s)")
+        for name, value in trace["counters"].items():
+            print(f"{name}: {value}")
+        print_token_usage(trace["counters"])
+    
+    # Print per-round statistics
+    print("\n=== Per-Round Statistics ===")
+    for name, summary in stats.aggregator.summary().items():
+        print(f"{name}: mean {summary['mean_return']:+.2f} chips/round "
+              f"(std {summary['std_return']:.2f}), max drawdown {summary['max_drawdown']}, "
+              f"W/L/P/B {summary['WIN']}/{summary['LOSE']}/{summary['PUSH']}/{summary['BUST']}")
+    
     # Print final statistics
     print("\n=== Final Chips Statistics ===")
-    for player_chips, dealer_chips in final_results:
+    for player_chips, dealer_chips, dealer_shadow in final_results:
         for name, chips in player_chips.items():
             profit = chips - 1000
             print(f"{name}: {chips} chips ({'+' if profit >= 0 else ''}{profit})")
         dealer_profit = dealer_chips - 5000
         print(f"Dealer: {dealer_chips} chips ({'+' if dealer_profit >= 0 else ''}{dealer_profit})")
+        if dealer_shadow and dealer_shadow["samples"]:
+            print(f"Dealer GPT shadow disagreement: {dealer_shadow['disagreement_rate']:.1%} "
+                  f"of {dealer_shadow['samples']} sampled decisions")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,40 @@
+from typing import Optional
+from .dealer_agent import DealerAgent, API_BASE_URL, API_KEY
+from .decision_cache import DecisionCache
+from .llm_client import LLMClient
+from ..models.dealer import Dealer
+
+class AsyncDealerAgent(DealerAgent):
+    """DealerAgent on the async side of the shared LLMClient; should_hit is a coroutine"""
+    def __init__(self, base_url: str = API_BASE_URL, api_key: str = API_KEY,
+                 cache: Optional[DecisionCache] = None, client: Optional[LLMClient] = None,
+                 mode: str = "llm", shadow_rate: float = 0.0, seed: Optional[int] = None):
+        super().__init__(base_url, api_key, cache, client, mode, shadow_rate, seed)
+    
+    async def _request_hit(self) -> bool:
+        self.llm_calls += 1
+        response = await self.client.acreate(
+            model="gpt-4o-mini",
+            messages=self._hit_messages(),
+            max_tokens=1,
+            temperature=0.1
+        )
+        self.usage.record(response)
+        return self._parse_hit(response.choices[0].message.content)
+    
+    async def should_hit(self) -> bool:
+        """
+        Use GPT (or the dealer rule in rule mode) to decide whether dealer should hit
+        Returns: True if should hit, False if should stand
+        """
+        if self.mode == "rule":
+            return DealerAgent.should_hit(self)
+        
+        try:
+            if self.cache is None:
+                return await self._request_hit()
+            return await self.cache.get_or_compute_async(self._hit_key(), self._request_hit)
+        except Exception as e:
+            print(f"Error using GPT API for dealer: {e}")
+            self.fallbacks += 1
+            return Dealer.should_hit(self)
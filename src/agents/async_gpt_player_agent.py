@@ -0,0 +1,85 @@
+from typing import Optional
+from .gpt_player_agent import GPTPlayerAgent, API_BASE_URL, API_KEY
+from .decision_cache import DecisionCache
+from .batch_dispatcher import BatchDispatcher
+from .llm_client import LLMClient
+from ..models.card import Card
+
+class AsyncGPTPlayerAgent(GPTPlayerAgent):
+    """
+    GPTPlayerAgent on the async side of the shared LLMClient. decide_bet and
+    decide_action are coroutines, so this agent must be driven by AsyncGameEngine.
+    With a dispatcher, decisions are batched with those of the other tables
+    sharing it instead of being sent one request each; the requests and
+    their tokens are then counted by the dispatcher, not by llm_calls/usage.
+    """
+    def __init__(self, name: str = "GPT Player", style: str = "normal",
+                 base_url: str = API_BASE_URL, api_key: str = API_KEY,
+                 cache: Optional[DecisionCache] = None, client: Optional[LLMClient] = None,
+                 dispatcher: Optional[BatchDispatcher] = None):
+        super().__init__(name, style, base_url, api_key, cache, client)
+        self.dispatcher = dispatcher
+    
+    async def _request_bet(self) -> int:
+        if self.dispatcher is not None:
+            answer = await self.dispatcher.submit(
+                {"type": "bet", "style": self._style_key(), "chips": self.chips})
+            return self._parse_bet(answer)
+        self.llm_calls += 1
+        response = await self.client.acreate(
+            model="gpt-4o-mini",
+            messages=self._bet_messages(),
+            max_tokens=10,
+            temperature=0.3
+        )
+        self.usage.record(response)
+        return self._parse_bet(response.choices[0].message.content)
+    
+    async def _request_action(self, dealer_up_card: Card) -> str:
+        if self.dispatcher is not None:
+            answer = await self.dispatcher.submit({
+                "type": "action",
+                "style": self._style_key(),
+                "hand": [str(card) for card in self.hand.cards],
+                "total": self.hand.get_value(),
+                "dealer": str(dealer_up_card),
+            })
+            return self._parse_action(answer, dealer_up_card)
+        self.llm_calls += 1
+        response = await self.client.acreate(
+            model="gpt-4o-mini",
+            messages=self._action_messages(dealer_up_card),
+            max_tokens=1,
+            temperature=0.1
+        )
+        self.usage.record(response)
+        return self._parse_action(response.choices[0].message.content, dealer_up_card)
+    
+    async def decide_bet(self) -> int:
+        """
+        Decide how much to bet based on available chips and style
+        Returns: bet amount
+        """
+        try:
+            if self.cache is None:
+                return await self._request_bet()
+            return await self.cache.get_or_compute_async(self._bet_key(), self._request_bet)
+        except Exception as e:
+            print(f"Error deciding bet: {e}")
+            self.fallbacks += 1
+            return self._default_bet()
+    
+    async def decide_action(self, dealer_up_card: Card) -> str:
+        """
+        Use GPT to decide whether to hit or stand based on style
+        Returns: 'H' for hit, 'S' for stand
+        """
+        try:
+            if self.cache is None:
+                return await self._request_action(dealer_up_card)
+            return await self.cache.get_or_compute_async(self._action_key(dealer_up_card),
+                                                         lambda: self._request_action(dealer_up_card))
+        except Exception as e:
+            print(f"Error using GPT API: {e}")
+            self.fallbacks += 1
+            return super(GPTPlayerAgent, self).decide_action(dealer_up_card)
@@ -2,54 +2,70 @@ from .player_agent import PlayerAgent
 from ..models.card import Card
 
 class BasicPlayerAgent(PlayerAgent):
-    def __init__(self, name: str = "Basic Player"):
+    def __init__(self, name: str = "Basic Player",
+                 low_chips: int = 500, high_chips: int = 2000,
+                 low_ratio: float = 0.1, mid_ratio: float = 0.15, high_ratio: float = 0.2,
+                 soft_hit_max: int = 17, soft_hit_vs: int = 9,
+                 hard_hit_max: int = 11, hard_stand_min: int = 17, dealer_weak_max: int = 6):
         super().__init__(name)
+        # 下注参数：筹码阈值和对应的下注比例
+        self.low_chips = low_chips
+        self.high_chips = high_chips
+        self.low_ratio = low_ratio
+        self.mid_ratio = mid_ratio
+        self.high_ratio = high_ratio
+        # 要牌参数：软手/硬手的要牌上限，以及庄家弱牌的上限
+        self.soft_hit_max = soft_hit_max
+        self.soft_hit_vs = soft_hit_vs
+        self.hard_hit_max = hard_hit_max
+        self.hard_stand_min = hard_stand_min
+        self.dealer_weak_max = dealer_weak_max
         
     def decide_bet(self) -> int:
         """
-        使用固定的下注策略：
-        - 如果筹码小于500，下注10%
-        - 如果筹码在500-2000之间，下注15%
-        - 如果筹码大于2000，下注20%
+        使用按筹码分档的下注策略（括号内为默认值）：
+        - 如果筹码小于low_chips(500)，下注low_ratio(10%)
+        - 如果筹码在low_chips-high_chips(2000)之间，下注mid_ratio(15%)
+        - 如果筹码大于high_chips，下注high_ratio(20%)
         """
-        if self.chips < 500:
-            bet_ratio = 0.1
-        elif self.chips < 2000:
-            bet_ratio = 0.15
+        if self.chips < self.low_chips:
+            bet_ratio = self.low_ratio
+        elif self.chips < self.high_chips:
+            bet_ratio = self.mid_ratio
         else:
-            bet_ratio = 0.2
+            bet_ratio = self.high_ratio
             
         bet = max(10, min(int(self.chips * bet_ratio), self.chips))
         return bet
         
     def decide_action(self, dealer_up_card: Card) -> str:
         """
-        使用固定的基本策略：
+        使用基本策略（括号内为默认值）：
         1. 如果有A（软手）：
-           - 17及以下要牌
-           - 18看庄家牌（9及以上要牌）
-           - 19及以上停牌
+           - soft_hit_max(17)及以下要牌
+           - soft_hit_max+1(18)看庄家牌（soft_hit_vs(9)及以上要牌）
+           - 更大停牌
         2. 无A（硬手）：
-           - 11及以下要牌
-           - 12-16看庄家牌（2-6停牌，7及以上要牌）
-           - 17及以上停牌
+           - hard_hit_max(11)及以下要牌
+           - 到hard_stand_min(17)之前看庄家牌（2-dealer_weak_max(6)停牌，否则要牌）
+           - hard_stand_min及以上停牌
         """
         player_value = self.hand.get_value()
         dealer_value = dealer_up_card.get_value()
         
         # 检查是否有A
-        has_ace = any(card.rank.value == 1 for card in self.hand.cards)
+        has_ace = self.hand.num_aces > 0
         if has_ace and player_value <= 21:  # 软手
-            if player_value <= 17:
+            if player_value <= self.soft_hit_max:
                 return 'H'
-            elif player_value == 18:
-                return 'H' if dealer_value >= 9 else 'S'
+            elif player_value == self.soft_hit_max + 1:
+                return 'H' if dealer_value >= self.soft_hit_vs else 'S'
             else:
                 return 'S'
         else:  # 硬手
-            if player_value <= 11:
+            if player_value <= self.hard_hit_max:
                 return 'H'
-            elif 12 <= player_value <= 16:
-                return 'S' if 2 <= dealer_value <= 6 else 'H'
+            elif player_value < self.hard_stand_min:
+                return 'S' if 2 <= dealer_value <= self.dealer_weak_max else 'H'
             else:
                 return 'S'
@@ -0,0 +1,138 @@
+import asyncio
+import json
+from typing import Dict, List, Optional, Tuple
+from .gpt_player_agent import BET_TIPS, ACTION_TIPS
+from .llm_client import LLMClient, TokenUsage, per_call_tokens
+
+# Reply budget per query: a bet or 'H'/'S' plus its id and JSON punctuation
+TOKENS_PER_ANSWER = 8
+
+BATCH_SYSTEM_PROMPT = """你是21点决策服务，同时为多个玩家做决策。
+
+游戏规则提示:
+1. A可以算1点或11点
+2. J/Q/K都算10点
+3. 爆牌(超过21点)直接输
+4. 庄家17点及以上必须停牌
+
+用户消息是JSON: {{"queries": [...]}}，每个query有id、type和style。
+- type为"bet": chips是玩家筹码，最小下注10，最大下注chips，回答下注数量(数字字符串)。
+- type为"action": hand是手牌，total是总点数，dealer是庄家明牌，要牌回答"H"，停牌回答"S"。
+
+下注策略提示:
+{bet_tips}
+
+要牌策略提示:
+{action_tips}
+
+只回复JSON: {{"answers": {{"<id>": "<回答>", ...}}}}，每个query都要回答。"""
+
+def _style_tips(tips: Dict[str, str]) -> str:
+    return "\n".join(f"[{style}]\n{text}" for style, text in tips.items())
+
+class BatchDispatcher:
+    """
+    Collects bet and hit/stand queries from many concurrent tables and sends
+    each window's worth as one chat completion, so the rules and style tips
+    are paid for once per batch instead of once per decision. A batch goes
+    out `window` seconds after its first query or as soon as it holds
+    max_batch queries. Must be used from a single event loop.
+    Token usage is recorded per request; tables that share a dispatcher
+    should share one PhaseTracer too, since every tracer that collects it
+    counts all of its requests.
+    """
+    def __init__(self, client: LLMClient, window: float = 0.02, max_batch: int = 64,
+                 model: str = "gpt-4o-mini"):
+        self.client = client
+        self.window = window
+        self.max_batch = max_batch
+        self.model = model
+        self.system_prompt = BATCH_SYSTEM_PROMPT.format(bet_tips=_style_tips(BET_TIPS),
+                                                        action_tips=_style_tips(ACTION_TIPS))
+        self.requests = 0
+        self.items = 0
+        self.errors = 0
+        self.usage = TokenUsage()
+        self._pending: List[Tuple[Dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._in_flight = set()  # Keeps sending tasks referenced until they finish
+    
+    async def submit(self, query: Dict) -> str:
+        """
+        Queue one query (type, style and state fields) for the next batch
+        Returns: the model's raw answer for it
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((query, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = asyncio.ensure_future(self._flush_later())
+        return await future
+    
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        self._timer = None
+        self._flush_now()
+    
+    def _flush_now(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._send(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+    
+    async def _send(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        queries = [dict(query, id=i) for i, (query, _) in enumerate(batch)]
+        self.requests += 1
+        self.items += len(batch)
+        try:
+            response = await self.client.acreate(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": json.dumps({"queries": queries}, ensure_ascii=False,
+                                                           separators=(",", ":"))}
+                ],
+                max_tokens=16 + TOKENS_PER_ANSWER * len(batch),
+                temperature=0.1,
+                response_format={"type": "json_object"}
+            )
+            self.usage.record(response)
+            # JSON mode guarantees JSON, not this shape
+            answers = json.loads(response.choices[0].message.content)["answers"]
+            if not isinstance(answers, dict):
+                raise ValueError(f"Expected an answers object, got {type(answers).__name__}")
+            for i, (_, future) in enumerate(batch):
+                if not future.done():
+                    # A missing answer is handed back empty and the agent falls back on it
+                    future.set_result(str(answers.get(str(i), "")))
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            # Every waiting agent gets the error and falls back, none is left hanging
+            self.errors += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+    
+    @property
+    def llm_calls(self) -> int:
+        """Requests sent, under the name PhaseTracer collects from agents"""
+        return self.requests
+    
+    def stats(self) -> Dict[str, float]:
+        usage = self.usage.counts()
+        return {
+            "requests": self.requests,
+            "items": self.items,
+            "errors": self.errors,
+            "items_per_request": self.items / self.requests if self.requests else 0.0,
+            **usage,
+            **per_call_tokens(usage),
+        }
@@ -0,0 +1,25 @@
+from .basic_player_agent import BasicPlayerAgent
+
+class CountingPlayerAgent(BasicPlayerAgent):
+    """
+    BasicPlayerAgent that sizes bets by the Hi-Lo true count read from the
+    shoe view of its table. BasicPlayerAgent's bet is the maximum, reached
+    at a true count of max_units; it is split into max_units units and one
+    unit is bet while the count is below 2. Hit/stand follows basic strategy.
+    """
+    def __init__(self, name: str = "Counting Player", max_units: int = 4):
+        super().__init__(name)
+        self.max_units = max_units
+    
+    def decide_bet(self) -> int:
+        """
+        Bet 1 unit below a true count of 2, else one unit per point of true
+        count up to max_units. The count is the one from before this round's
+        deal, as it would be at a real table.
+        """
+        full_bet = super().decide_bet()
+        if self.shoe is None:
+            return full_bet
+        true_count = self.shoe.marked_true_count
+        units = 1 if true_count < 2 else min(self.max_units, int(true_count))
+        return max(10, min(full_bet * units // self.max_units, self.chips))
@@ -1,69 +1,179 @@
-from typing import List
-from openai import OpenAI
+import random
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from threading import Lock
+from typing import Dict, List, Optional
+from .decision_cache import DecisionCache
+from .llm_client import LLMClient, TokenUsage, get_client
 from ..models.dealer import Dealer
 from ..models.card import Card
 
 API_BASE_URL = ""
 API_KEY = ""
 
-class DealerAgent(Dealer):
-    def __init__(self):
-        super().__init__()
-        self.client = OpenAI(base_url=API_BASE_URL, api_key=API_KEY)
-        
-    def should_hit(self) -> bool:
-        """
-        Use GPT to decide whether dealer should hit
-        Returns: True if should hit, False if should stand
-        """
-        # 构建游戏状态描述
-        prompt = f"""
-        你是一位21点游戏的庄家。你需要根据当前状态决定是否要牌。
+# 只有最后一条用户消息随局面变化，前面的消息逐字节固定，便于服务端缓存前缀
+HIT_STATE = "手牌: {hand}\n点数: {total}"
+HIT_PREFIX = (
+    {"role": "system", "content": """你是一个21点庄家，根据当前状态决定是否要牌。
 
-        庄家规则提示:
-        1. 17点及以上必须停牌
-        2. 16点及以下必须要牌
-        3. A可以算1点或11点
-        4. 爆牌(超过21点)直接输
+庄家规则提示:
+1. 17点及以上必须停牌
+2. 16点及以下必须要牌
+3. A可以算1点或11点
+4. 爆牌(超过21点)直接输
 
-        当前状态:
-        - 你的手牌: {', '.join(str(card) for card in self.hand.cards)}
-        - 手牌总点数: {self.hand.get_value()}
+用户消息是你的手牌和手牌总点数。要牌只回复字母'H'，停牌只回复字母'S'。"""},
+    {"role": "user", "content": HIT_STATE.format(hand="KING of ♠, SEVEN of ♣", total=17)},
+    {"role": "assistant", "content": "S"},
+    {"role": "user", "content": HIT_STATE.format(hand="NINE of ♥, FIVE of ♣", total=14)},
+    {"role": "assistant", "content": "H"},
+)
 
-        请分析当前状态，并严格按照以下格式回复:
-        1. 如果决定要牌，只回复字母'H'
-        2. 如果决定停牌，只回复字母'S'
-        """
+class DealerAgent(Dealer):
+    """
+    Dealer that asks GPT whether to hit (mode="llm"), or decides locally with
+    the fixed dealer rule at zero latency (mode="rule"). In rule mode a
+    shadow_rate fraction of decisions is also sent to GPT in the background
+    and compared with the rule, without blocking the round.
+    """
+    def __init__(self, base_url: str = API_BASE_URL, api_key: str = API_KEY,
+                 cache: Optional[DecisionCache] = None, client: Optional[LLMClient] = None,
+                 mode: str = "llm", shadow_rate: float = 0.0, seed: Optional[int] = None):
+        super().__init__()
+        if mode not in ("llm", "rule"):
+            raise ValueError(f"Unknown dealer mode: {mode}")
+        self.client = client if client is not None else get_client(base_url, api_key)
+        self.cache = cache  # Shared decision cache, None to always call the API
+        self.mode = mode
+        self.llm_calls = 0
+        self.fallbacks = 0  # Decisions made by the dealer rule after a failed GPT call
+        self.usage = TokenUsage()  # Includes shadow checks
+        self.shadow_rate = shadow_rate
+        self._shadow_rng = random.Random(seed)  # Kept apart from the shoe's RNG
+        self._shadow_executor: Optional[ThreadPoolExecutor] = None
+        self._shadow_futures: List[Future] = []
+        self._shadow_lock = Lock()
+        self.shadow_samples = 0
+        self.shadow_disagreements = 0
+        self.shadow_errors = 0
+    
+    def _hit_key(self) -> tuple:
+        """Canonical state for the dealer's decision"""
+        composition = sorted(card.get_value() for card in self.hand.cards)
+        return ("dealer", composition, self.hand.get_value())
+    
+    def _hit_messages(self) -> List[Dict[str, str]]:
+        """Build the chat messages for the dealer's hit/stand decision: the fixed prefix plus the hand"""
+        state = HIT_STATE.format(hand=', '.join(str(card) for card in self.hand.cards), total=self.hand.get_value())
+        return [*HIT_PREFIX, {"role": "user", "content": state}]
+    
+    def _parse_hit(self, content: str) -> bool:
+        """Turn a model reply into a hit (True) or stand (False) decision"""
+        decision = content.strip().upper()
         
+        # 返回决策
+        if decision and decision[0] in ['H', 'S']:
+            return decision[0] == 'H'
+        
+        # 如果GPT返回的不是有效决策，使用基本规则
+        self.fallbacks += 1
+        return super().should_hit()
+    
+    def _request_hit(self) -> bool:
+        self.llm_calls += 1
+        response = self.client.create(
+            model="gpt-4o-mini",
+            messages=self._hit_messages(),
+            max_tokens=1,
+            temperature=0.1
+        )
+        self.usage.record(response)
+        return self._parse_hit(response.choices[0].message.content)
+        
+    def _shadow_check(self, messages: List[Dict[str, str]], rule_decision: bool):
+        """Ask GPT in the background and record whether it agrees with the rule"""
         try:
-            response = self.client.chat.completions.create(
+            response = self.client.create(
                 model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": """你是一个21点庄家。
-你必须严格遵守庄家规则：17及以上停牌，16及以下要牌。
-你的回复必须简洁，只能是'H'或'S'。"""},
-                    {"role": "assistant", "content": "明白。我会严格按照庄家规则行事，并只回复'H'或'S'。"},
-                    {"role": "user", "content": "手牌: KING of ♠, SEVEN of ♣"},
-                    {"role": "assistant", "content": "S"},
-                    {"role": "user", "content": "手牌: NINE of ♥, FIVE of ♣"},
-                    {"role": "assistant", "content": "H"},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=messages,
                 max_tokens=1,
                 temperature=0.1
             )
-            
-            # 获取决策
+            self.usage.record(response)
             decision = response.choices[0].message.content.strip().upper()
-            
-            # 返回决策
-            if decision and decision[0] in ['H', 'S']:
-                return decision[0] == 'H'
-            
-            # 如果GPT返回的不是有效决策，使用基本规则
-            return self.hand.get_value() < 17
+        except Exception:
+            decision = ""
+        with self._shadow_lock:
+            if not decision or decision[0] not in ['H', 'S']:
+                self.shadow_errors += 1
+                return
+            self.shadow_samples += 1
+            if (decision[0] == 'H') != rule_decision:
+                self.shadow_disagreements += 1
+    
+    def _maybe_shadow(self, rule_decision: bool):
+        """Submit a sampled shadow check for the current hand"""
+        if self._shadow_rng.random() >= self.shadow_rate:
+            return
+        if self._shadow_executor is None:
+            self._shadow_executor = ThreadPoolExecutor(max_workers=2)
+        self._shadow_futures = [f for f in self._shadow_futures if not f.done()]
+        self._shadow_futures.append(
+            self._shadow_executor.submit(self._shadow_check, self._hit_messages(), rule_decision)
+        )
+    
+    def shadow_stats(self, wait_pending: bool = True) -> Dict[str, float]:
+        """
+        Shadow sampling results; by default waits for checks still in flight
+        Returns: samples, disagreements, errors and disagreement rate
+        """
+        if wait_pending:
+            wait(self._shadow_futures)
+        with self._shadow_lock:
+            return {
+                "samples": self.shadow_samples,
+                "disagreements": self.shadow_disagreements,
+                "errors": self.shadow_errors,
+                "disagreement_rate": (self.shadow_disagreements / self.shadow_samples
+                                      if self.shadow_samples else 0.0),
+            }
+    
+    def snapshot(self) -> Dict:
+        """Shadow sampling state between rounds, once pending checks have finished"""
+        counts = self.shadow_stats()
+        return {
+            "shadow_rng": self._shadow_rng.getstate(),
+            "shadow_samples": counts["samples"],
+            "shadow_disagreements": counts["disagreements"],
+            "shadow_errors": counts["errors"],
+        }
+    
+    def restore(self, state: Dict):
+        """Return to a state taken with snapshot()"""
+        self._shadow_rng.setstate(state["shadow_rng"])
+        with self._shadow_lock:
+            self.shadow_samples = state["shadow_samples"]
+            self.shadow_disagreements = state["shadow_disagreements"]
+            self.shadow_errors = state["shadow_errors"]
+        
+    def should_hit(self) -> bool:
+        """
+        Use GPT (or the dealer rule in rule mode) to decide whether dealer should hit
+        Returns: True if should hit, False if should stand
+        """
+        if self.mode == "rule":
+            decision = super().should_hit()
+            if self.shadow_rate:
+                self._maybe_shadow(decision)
+            return decision
+        
+        try:
+            # 获取决策
+            if self.cache is None:
+                return self._request_hit()
+            return self.cache.get_or_compute(self._hit_key(), self._request_hit)
             
         except Exception as e:
             print(f"Error using GPT API for dealer: {e}")
             # 发生错误时使用基本规则
-            return self.hand.get_value() < 17
+            self.fallbacks += 1
+            return super().should_hit()
@@ -0,0 +1,126 @@
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+class DecisionCache:
+    """
+    Memoizes LLM decisions keyed by a canonical game-state tuple.
+    Entries are evicted least-recently-used beyond maxsize and expire after
+    ttl seconds (None = never). With a path, entries are also written through
+    to a SQLite file so they survive restarts and can be shared by workers.
+    Failed computations are not cached.
+    """
+    def __init__(self, maxsize: int = 4096, ttl: Optional[float] = None, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS decisions (key TEXT PRIMARY KEY, value TEXT, stored_at REAL)"
+            )
+            self._db.commit()
+        
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.hit_seconds = 0.0
+        self.miss_seconds = 0.0
+    
+    @staticmethod
+    def _encode(key: Hashable) -> str:
+        return json.dumps(key, separators=(",", ":"))
+    
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached decision for a state, or None"""
+        encoded = self._encode(key)
+        with self._lock:
+            entry = self._entries.get(encoded)
+            if entry is not None:
+                if not self._expired(entry[1]):
+                    self._entries.move_to_end(encoded)
+                    return entry[0]
+                del self._entries[encoded]
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT value, stored_at FROM decisions WHERE key = ?", (encoded,)
+            ).fetchone()
+            if row is None or self._expired(row[1]):
+                return None
+            value = json.loads(row[0])
+            self._insert(encoded, value, row[1])
+            return value
+    
+    def put(self, key: Hashable, value: Any):
+        """Store a decision for a state"""
+        encoded = self._encode(key)
+        stored_at = time.time()
+        with self._lock:
+            self._insert(encoded, value, stored_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO decisions (key, value, stored_at) VALUES (?, ?, ?)",
+                    (encoded, json.dumps(value), stored_at),
+                )
+                self._db.commit()
+    
+    def _insert(self, encoded: str, value: Any, stored_at: float):
+        self._entries[encoded] = (value, stored_at)
+        self._entries.move_to_end(encoded)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached decision, or compute, store and return it"""
+        start = time.perf_counter()
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            self.hit_seconds += time.perf_counter() - start
+            return value
+        value = compute()
+        self.put(key, value)
+        self.misses += 1
+        self.miss_seconds += time.perf_counter() - start
+        return value
+    
+    async def get_or_compute_async(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of get_or_compute for coroutine computations"""
+        start = time.perf_counter()
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            self.hit_seconds += time.perf_counter() - start
+            return value
+        value = await compute()
+        self.put(key, value)
+        self.misses += 1
+        self.miss_seconds += time.perf_counter() - start
+        return value
+    
+    def stats(self) -> Dict[str, float]:
+        """Hit rate and mean latency of hits and misses (seconds)"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "mean_hit_latency": self.hit_seconds / self.hits if self.hits else 0.0,
+            "mean_miss_latency": self.miss_seconds / self.misses if self.misses else 0.0,
+            "size": len(self._entries),
+        }
+    
+    def close(self):
+        """Close the SQLite store, if any"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
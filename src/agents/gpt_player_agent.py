@@ -1,127 +1,185 @@
-from typing import Optional
-from openai import OpenAI
+from typing import Dict, List, Optional, Tuple
 from .player_agent import PlayerAgent
+from .decision_cache import DecisionCache
+from .llm_client import LLMClient, TokenUsage, get_client
 from ..models.card import Card
 
 API_BASE_URL = ""
 API_KEY = ""
 
+# 各风格的策略提示
+BET_TIPS = {
+    'conservative': '1. 优先保护本金\n2. 建议每次下注不超过总筹码的10%\n3. 如果筹码较少，应该更保守',
+    'aggressive': '1. 追求高回报\n2. 建议每次下注20%-30%的筹码\n3. 如果筹码充足，可以更激进',
+}
+ACTION_TIPS = {
+    'conservative': '1. 优先避免爆牌\n2. 17及以上一定停牌\n3. 12-16时，庄家2-6停牌，否则要牌\n4. 尽量避免冒险',
+    'aggressive': '1. 追求更大点数\n2. 16及以下经常要牌\n3. 即使有爆牌风险也要追求更大点数\n4. 敢于冒险',
+}
+STYLE_NAMES = {'conservative': '保守', 'aggressive': '激进'}
+STYLE_HINTS = {
+    'conservative': '你应该优先考虑安全，避免爆牌风险。',
+    'aggressive': '你应该勇于冒险，追求更大的点数。',
+}
+
+# 每次请求只有最后一条用户消息随局面变化；前面的消息按风格预先生成、逐字节固定，
+# 这样服务端可以缓存整段前缀，每次决策只需处理很短的状态后缀
+BET_STATE = "筹码: {chips}"
+ACTION_STATE = "手牌: {hand}\n点数: {total}\n庄家明牌: {dealer}"
+
+def _bet_prefix(style: str) -> Tuple[Dict[str, str], ...]:
+    name = STYLE_NAMES[style]
+    return (
+        {"role": "system", "content": f"""你是一个{name}的21点玩家，精通筹码管理和风险控制。
+每局开始前决定下注多少筹码：最小下注10，最大下注为你的全部筹码。
+
+{name}策略提示:
+{BET_TIPS[style]}
+
+用户消息是你当前的筹码。只回复一个数字，表示你要下注的筹码数量。"""},
+    )
+
+def _action_prefix(style: str) -> Tuple[Dict[str, str], ...]:
+    name = STYLE_NAMES[style]
+    return (
+        {"role": "system", "content": f"""你是一个{name}的21点玩家，根据当前状态和你的风格决定要牌还是停牌。
+{STYLE_HINTS[style]}
+
+游戏规则提示:
+1. A可以算1点或11点
+2. J/Q/K都算10点
+3. 爆牌(超过21点)直接输
+4. 庄家17点及以上必须停牌
+
+{name}策略提示:
+{ACTION_TIPS[style]}
+
+用户消息是你的手牌、手牌总点数和庄家明牌。要牌只回复字母'H'，停牌只回复字母'S'。"""},
+        {"role": "user", "content": ACTION_STATE.format(hand="KING of ♠, FIVE of ♣", total=15, dealer="SIX of ♥")},
+        {"role": "assistant", "content": "S"},
+        {"role": "user", "content": ACTION_STATE.format(hand="ACE of ♥, FIVE of ♣", total=16, dealer="TEN of ♦")},
+        {"role": "assistant", "content": "H"},
+    )
+
+# 按风格预先生成的固定前缀
+BET_PREFIXES = {style: _bet_prefix(style) for style in STYLE_NAMES}
+ACTION_PREFIXES = {style: _action_prefix(style) for style in STYLE_NAMES}
+
 class GPTPlayerAgent(PlayerAgent):
-    def __init__(self, name: str = "GPT Player", style: str = "normal"):
+    def __init__(self, name: str = "GPT Player", style: str = "normal",
+                 base_url: str = API_BASE_URL, api_key: str = API_KEY,
+                 cache: Optional[DecisionCache] = None, client: Optional[LLMClient] = None):
         super().__init__(name)
-        self.client = OpenAI(base_url=API_BASE_URL, api_key=API_KEY)
+        self.client = client if client is not None else get_client(base_url, api_key)
         self.style = style  # "conservative" or "aggressive"
+        self.cache = cache  # Shared decision cache, None to always call the API
+        self.llm_calls = 0
+        self.fallbacks = 0  # Decisions made by the default strategy instead of GPT
+        self.usage = TokenUsage()
+    
+    def _style_key(self) -> str:
+        return 'conservative' if self.style == 'conservative' else 'aggressive'
+    
+    def _bet_messages(self) -> List[Dict[str, str]]:
+        """Build the chat messages for the betting decision: the style's fixed prefix plus the chips"""
+        return [*BET_PREFIXES[self._style_key()], {"role": "user", "content": BET_STATE.format(chips=self.chips)}]
+    
+    def _default_bet(self) -> int:
+        """Fallback betting strategy"""
+        default_ratio = 0.1 if self.style == 'conservative' else 0.25
+        return max(10, min(int(self.chips * default_ratio), self.chips))
+    
+    def _parse_bet(self, content: str) -> int:
+        """Turn a model reply into a valid bet"""
+        try:
+            bet = int(content.strip())
+            # 确保下注在合理范围内
+            return max(10, min(bet, self.chips))
+        except ValueError:
+            # 如果无法解析为数字，使用默认策略
+            self.fallbacks += 1
+            return self._default_bet()
+    
+    def _bet_key(self) -> tuple:
+        """Canonical state for the betting decision"""
+        return ("bet", self._style_key(), self.chips)
+    
+    def _action_key(self, dealer_up_card: Card) -> tuple:
+        """Canonical state for the hit/stand decision"""
+        composition = sorted(card.get_value() for card in self.hand.cards)
+        return ("action", self._style_key(), composition, self.hand.get_value(), dealer_up_card.get_value())
+    
+    def _action_messages(self, dealer_up_card: Card) -> List[Dict[str, str]]:
+        """Build the chat messages for the hit/stand decision: the style's fixed prefix plus the hand"""
+        state = ACTION_STATE.format(hand=', '.join(str(card) for card in self.hand.cards),
+                                    total=self.hand.get_value(), dealer=dealer_up_card)
+        return [*ACTION_PREFIXES[self._style_key()], {"role": "user", "content": state}]
+    
+    def _parse_action(self, content: str, dealer_up_card: Card) -> str:
+        """Turn a model reply into 'H' or 'S'"""
+        decision = content.strip().upper()
+        
+        # 确保返回合法的决策
+        if decision and decision[0] in ['H', 'S']:
+            return decision[0]
+        
+        # 如果GPT返回的不是有效决策，使用基本策略
+        self.fallbacks += 1
+        return super().decide_action(dealer_up_card)
+    
+    def _request_bet(self) -> int:
+        self.llm_calls += 1
+        response = self.client.create(
+            model="gpt-4o-mini",
+            messages=self._bet_messages(),
+            max_tokens=10,
+            temperature=0.3
+        )
+        self.usage.record(response)
+        return self._parse_bet(response.choices[0].message.content)
+    
+    def _request_action(self, dealer_up_card: Card) -> str:
+        self.llm_calls += 1
+        response = self.client.create(
+            model="gpt-4o-mini",
+            messages=self._action_messages(dealer_up_card),
+            max_tokens=1,
+            temperature=0.1
+        )
+        self.usage.record(response)
+        return self._parse_action(response.choices[0].message.content, dealer_up_card)
         
     def decide_bet(self) -> int:
         """
         Decide how much to bet based on available chips and style
         Returns: bet amount
         """
-        prompt = f"""
-        你是一位{'保守' if self.style == 'conservative' else '激进'}的21点玩家，需要决定这一局下注多少筹码。
-        
-        当前状态:
-        - 你的筹码: {self.chips}
-        - 最小下注: 10
-        - 最大下注: {self.chips}
-        
-        {'保守策略提示:' if self.style == 'conservative' else '激进策略提示:'}
-        {'1. 优先保护本金\n2. 建议每次下注不超过总筹码的10%\n3. 如果筹码较少，应该更保守' 
-          if self.style == 'conservative' else 
-         '1. 追求高回报\n2. 建议每次下注20%-30%的筹码\n3. 如果筹码充足，可以更激进'}
-        
-        请只回复一个数字，表示你要下注的筹码数量。
-        """
-        
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": f"你是一个{'保守' if self.style == 'conservative' else '激进'}的21点玩家，精通筹码管理和风险控制。"},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=10,
-                temperature=0.3
-            )
-            
             # 获取决策
-            bet_str = response.choices[0].message.content.strip()
-            try:
-                bet = int(bet_str)
-                # 确保下注在合理范围内
-                bet = max(10, min(bet, self.chips))
-                return bet
-            except ValueError:
-                # 如果无法解析为数字，使用默认策略
-                default_ratio = 0.1 if self.style == 'conservative' else 0.25
-                return max(10, min(int(self.chips * default_ratio), self.chips))
+            if self.cache is None:
+                return self._request_bet()
+            return self.cache.get_or_compute(self._bet_key(), self._request_bet)
             
         except Exception as e:
             print(f"Error deciding bet: {e}")
             # 发生错误时使用默认策略
-            default_ratio = 0.1 if self.style == 'conservative' else 0.25
-            return max(10, min(int(self.chips * default_ratio), self.chips))
+            self.fallbacks += 1
+            return self._default_bet()
         
     def decide_action(self, dealer_up_card: Card) -> str:
         """
         Use GPT to decide whether to hit or stand based on style
         Returns: 'H' for hit, 'S' for stand
         """
-        # 构建游戏状态描述
-        prompt = f"""
-        你是一位{'保守' if self.style == 'conservative' else '激进'}的21点玩家。你需要根据当前游戏状态做出最优决策。
-
-        游戏规则提示:
-        1. A可以算1点或11点
-        2. J/Q/K都算10点
-        3. 爆牌(超过21点)直接输
-        4. 庄家17点及以上必须停牌
-
-        {'保守策略提示:' if self.style == 'conservative' else '激进策略提示:'}
-        {'1. 优先避免爆牌\n2. 17及以上一定停牌\n3. 12-16时，庄家2-6停牌，否则要牌\n4. 尽量避免冒险' 
-          if self.style == 'conservative' else 
-         '1. 追求更大点数\n2. 16及以下经常要牌\n3. 即使有爆牌风险也要追求更大点数\n4. 敢于冒险'}
-
-        当前游戏状态:
-        - 你的手牌: {', '.join(str(card) for card in self.hand.cards)}
-        - 手牌总点数: {self.hand.get_value()}
-        - 庄家明牌: {dealer_up_card}
-
-        请根据你的风格分析当前状态，并严格按照以下格式回复:
-        1. 如果决定要牌，只回复字母'H'
-        2. 如果决定停牌，只回复字母'S'
-        """
-        
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": f"""你是一个{'保守' if self.style == 'conservative' else '激进'}的21点玩家。
-你的任务是根据当前状态和你的风格做出决策。
-{'你应该优先考虑安全，避免爆牌风险。' if self.style == 'conservative' else '你应该勇于冒险，追求更大的点数。'}
-你的回复必须简洁，只能是'H'或'S'。"""},
-                    {"role": "assistant", "content": "明白。我会根据基本策略和概率分析做出决策，并只回复'H'或'S'。"},
-                    {"role": "user", "content": "手牌: KING of ♠, FIVE of ♣\n庄家明牌: SIX of ♥"},
-                    {"role": "assistant", "content": "S"},
-                    {"role": "user", "content": "手牌: ACE of ♥, FIVE of ♣\n庄家明牌: TEN of ♦"},
-                    {"role": "assistant", "content": "H"},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1,
-                temperature=0.1
-            )
-            
             # 获取决策
-            decision = response.choices[0].message.content.strip().upper()
-            
-            # 确保返回合法的决策
-            if decision and decision[0] in ['H', 'S']:
-                return decision[0]
-            
-            # 如果GPT返回的不是有效决策，使用基本策略
-            return super().decide_action(dealer_up_card)
+            if self.cache is None:
+                return self._request_action(dealer_up_card)
+            return self.cache.get_or_compute(self._action_key(dealer_up_card),
+                                             lambda: self._request_action(dealer_up_card))
             
         except Exception as e:
             print(f"Error using GPT API: {e}")
             # 发生错误时使用基本策略
+            self.fallbacks += 1
             return super().decide_action(dealer_up_card)
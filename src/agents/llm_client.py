@@ -0,0 +1,202 @@
+import asyncio
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from openai import OpenAI, AsyncOpenAI
+
+class RateLimiter:
+    """Token bucket: refills `rate` tokens per second up to `burst`"""
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _try_acquire(self) -> float:
+        """Take a token if one is available, else return how long to wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+    
+    def acquire(self):
+        """Block until a request may be sent"""
+        wait = self._try_acquire()
+        while wait:
+            time.sleep(wait)
+            wait = self._try_acquire()
+    
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request may be sent"""
+        wait = self._try_acquire()
+        while wait:
+            await asyncio.sleep(wait)
+            wait = self._try_acquire()
+
+class TokenUsage:
+    """
+    Tokens used by one agent's requests, read from each response's usage:
+    prompt tokens, how many of them the provider served from its prompt
+    cache, and completion tokens. last holds the most recent call's counts.
+    Responses without usage (stubs, some compatible servers) are skipped.
+    """
+    def __init__(self):
+        self.responses = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self.last: Dict[str, int] = {}
+        self._lock = threading.Lock()  # Shadow checks record from worker threads
+    
+    def record(self, response) -> Dict[str, int]:
+        """Add one response's usage; returns its counts"""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return {}
+        details = getattr(usage, "prompt_tokens_details", None)
+        counts = {
+            "prompt_tokens": usage.prompt_tokens or 0,
+            "cached_tokens": getattr(details, "cached_tokens", None) or 0,
+            "completion_tokens": usage.completion_tokens or 0,
+        }
+        with self._lock:
+            self.responses += 1
+            self.prompt_tokens += counts["prompt_tokens"]
+            self.cached_tokens += counts["cached_tokens"]
+            self.completion_tokens += counts["completion_tokens"]
+            self.last = counts
+        return counts
+    
+    def counts(self) -> Dict[str, int]:
+        return {
+            "responses": self.responses,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
+    
+    def summary(self) -> Dict[str, float]:
+        """Totals plus per-call means and the cached share of prompt tokens"""
+        summary = self.counts()
+        summary.update(per_call_tokens(summary))
+        return summary
+
+def per_call_tokens(counts: Dict[str, int]) -> Dict[str, float]:
+    """Per-call means from summed TokenUsage counts (also usable on merged tracer counters)"""
+    responses = counts["responses"]
+    return {
+        "prompt_tokens_per_call": counts["prompt_tokens"] / responses if responses else 0.0,
+        "completion_tokens_per_call": counts["completion_tokens"] / responses if responses else 0.0,
+        "cached_share": counts["cached_tokens"] / counts["prompt_tokens"] if counts["prompt_tokens"] else 0.0,
+    }
+
+class LLMClient:
+    """
+    Chat completions client for one endpoint, shared by every agent in the
+    process. One OpenAI client (and one AsyncOpenAI client per event loop)
+    keeps its connection pool alive across agents and tables; requests are
+    bounded by max_concurrency and throttled by an optional token bucket.
+    openai is imported on the first request, so building agents that never
+    call the API (rule-mode dealers, cached runs) stays cheap.
+    """
+    def __init__(self, base_url: str, api_key: str, max_concurrency: Optional[int] = None,
+                 requests_per_second: Optional[float] = None, burst: int = 1,
+                 timeout: Optional[float] = None, max_retries: int = 2):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self._client_options: Dict[str, Any] = {"max_retries": max_retries}
+        if timeout is not None:
+            self._client_options["timeout"] = timeout
+        self._client: Optional["OpenAI"] = None
+        self._client_lock = threading.Lock()
+        self.limiter = RateLimiter(requests_per_second, burst) if requests_per_second else None
+        self._semaphore = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        # Async clients and semaphores are bound to the event loop that uses them
+        self._async_state: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple]" = \
+            weakref.WeakKeyDictionary()
+    
+    @property
+    def client(self) -> "OpenAI":
+        """The sync OpenAI client, created on first use"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    self._client = OpenAI(base_url=self.base_url, api_key=self.api_key,
+                                          **self._client_options)
+        return self._client
+    
+    def create(self, **kwargs):
+        """Send a chat completion request"""
+        if self.limiter is not None:
+            self.limiter.acquire()
+        if self._semaphore is None:
+            return self.client.chat.completions.create(**kwargs)
+        with self._semaphore:
+            return self.client.chat.completions.create(**kwargs)
+    
+    def _loop_state(self) -> Tuple["AsyncOpenAI", Optional[asyncio.Semaphore]]:
+        loop = asyncio.get_running_loop()
+        state = self._async_state.get(loop)
+        if state is None:
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(base_url=self.base_url, api_key=self.api_key, **self._client_options)
+            semaphore = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+            state = self._async_state[loop] = (client, semaphore)
+        return state
+    
+    async def acreate(self, **kwargs):
+        """Send a chat completion request from a coroutine"""
+        client, semaphore = self._loop_state()
+        if self.limiter is not None:
+            await self.limiter.acquire_async()
+        if semaphore is None:
+            return await client.chat.completions.create(**kwargs)
+        async with semaphore:
+            return await client.chat.completions.create(**kwargs)
+
+_clients: Dict[Tuple[str, str], Tuple[Any, Dict[str, Any]]] = {}
+_clients_lock = threading.Lock()
+
+def _build_client(base_url: str, api_key: str, record: Optional[str] = None, replay: Optional[str] = None,
+                  replay_latency: str = "none", **options):
+    if record is None and replay is None:
+        return LLMClient(base_url, api_key, **options)
+    from .llm_replay import CallStore, RecordingClient, ReplayClient
+    if replay is not None:
+        client = ReplayClient(CallStore(replay), latency=replay_latency)
+    else:
+        client = LLMClient(base_url, api_key, **options)
+    if record is not None:
+        client = RecordingClient(client, CallStore(record))
+    return client
+
+def get_client(base_url: str, api_key: str, **options):
+    """
+    Return the process-wide client for an endpoint, creating it on first use.
+    Options (max_concurrency, requests_per_second, burst, timeout, max_retries,
+    and record/replay/replay_latency, see llm_replay) configure the client
+    when it is created: record is a call store file every request is written
+    to, replay one to answer from instead of the endpoint, paced by
+    replay_latency ("none", "recorded" or "sampled"). A call without options
+    returns the existing client; a call whose options differ from the ones
+    the client was created with raises ValueError.
+    """
+    key = (base_url, api_key)
+    with _clients_lock:
+        entry = _clients.get(key)
+        if entry is None:
+            entry = _clients[key] = (_build_client(base_url, api_key, **options), options)
+        elif options and options != entry[1]:
+            raise ValueError(f"LLM client for {base_url!r} already created with options {entry[1]}, "
+                             f"not {options}")
+        return entry[0]
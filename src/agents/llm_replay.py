@@ -0,0 +1,182 @@
+"""
+Record/replay transport for chat completion calls.
+
+RecordingClient wraps a client (usually LLMClient) and writes every request
+it sends, with the response and its wall-clock latency, to a CallStore.
+ReplayClient answers the same requests from that store without a network,
+so LLM-agent throughput can be benchmarked and regression-tested offline.
+Both expose create and acreate like LLMClient, so agents take them as their
+client unchanged; get_client builds them from its record/replay options.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+# How ReplayClient paces its answers
+LATENCY_MODES = ("none", "recorded", "sampled")
+
+class ReplayMiss(LookupError):
+    """A replayed request that was never recorded"""
+
+def request_key(kwargs: Dict[str, Any]) -> str:
+    """Hash of a request's arguments; equal requests get equal keys"""
+    encoded = json.dumps(kwargs, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+
+def _to_plain(value: Any) -> Any:
+    """JSON-ready copy of a response, OpenAI model or namespace alike; None fields are dropped"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(exclude_none=True)
+    if isinstance(value, SimpleNamespace):
+        value = vars(value)
+    if isinstance(value, dict):
+        return {key: _to_plain(item) for key, item in value.items() if item is not None}
+    if isinstance(value, (list, tuple)):
+        return [_to_plain(item) for item in value]
+    return value
+
+def _to_namespace(value: Any) -> Any:
+    """Attribute access over a decoded response, as agents read OpenAI responses"""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: _to_namespace(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [_to_namespace(item) for item in value]
+    return value
+
+class CallStore:
+    """
+    SQLite file of recorded calls: request key, compact response JSON and
+    latency in seconds, in the order they were made. Several worker
+    processes may record into the same file.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        # WAL keeps a commit per call cheap when many workers record at once
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS calls (id INTEGER PRIMARY KEY, key TEXT, response TEXT, latency REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS calls_key ON calls (key)")
+        self._db.commit()
+    
+    def append(self, key: str, response: Any, latency: float):
+        """Record one call"""
+        encoded = json.dumps(_to_plain(response), ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._db.execute("INSERT INTO calls (key, response, latency) VALUES (?, ?, ?)",
+                             (key, encoded, latency))
+            self._db.commit()
+    
+    def load(self) -> Dict[str, List[Tuple[Any, float]]]:
+        """Every recorded (response, latency) per request key, oldest first"""
+        calls: Dict[str, List[Tuple[Any, float]]] = {}
+        with self._lock:
+            rows = self._db.execute("SELECT key, response, latency FROM calls ORDER BY id").fetchall()
+        for key, response, latency in rows:
+            calls.setdefault(key, []).append((json.loads(response), latency))
+        return calls
+    
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+class RecordingClient:
+    """Passes calls through to client and records each successful one in store"""
+    def __init__(self, client: Any, store: CallStore):
+        self.client = client
+        self.store = store
+        self.recorded = 0
+    
+    def create(self, **kwargs):
+        """Send a chat completion request and record it"""
+        start = time.perf_counter()
+        response = self.client.create(**kwargs)
+        self.store.append(request_key(kwargs), response, time.perf_counter() - start)
+        self.recorded += 1
+        return response
+    
+    async def acreate(self, **kwargs):
+        """Send a chat completion request from a coroutine and record it"""
+        start = time.perf_counter()
+        response = await self.client.acreate(**kwargs)
+        self.store.append(request_key(kwargs), response, time.perf_counter() - start)
+        self.recorded += 1
+        return response
+
+class ReplayClient:
+    """
+    Answers chat completion requests from a recording. A request recorded
+    several times gets its answers in recorded order, wrapping around.
+    latency picks the delay before each answer: "none" answers at once,
+    "recorded" waits as long as that answer originally took, "sampled"
+    draws from the latencies of the whole recording (seeded by seed).
+    Requests that were never recorded raise ReplayMiss, which agents treat
+    like any other API error.
+    """
+    def __init__(self, store: CallStore, latency: str = "none", seed: Optional[int] = None):
+        if latency not in LATENCY_MODES:
+            raise ValueError(f"Unknown replay latency mode: {latency}")
+        self.latency = latency
+        self._calls = {
+            key: [(_to_namespace(response), delay) for response, delay in answers]
+            for key, answers in store.load().items()
+        }
+        self._latencies = [delay for answers in self._calls.values() for _, delay in answers]
+        self._next: Dict[str, int] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        
+        # Counters
+        self.hits = 0
+        self.misses = 0
+    
+    def _answer(self, kwargs: Dict[str, Any]) -> Tuple[Any, float]:
+        key = request_key(kwargs)
+        with self._lock:
+            answers = self._calls.get(key)
+            if not answers:
+                self.misses += 1
+                raise ReplayMiss(f"No recorded response for request {key}")
+            index = self._next.get(key, 0)
+            self._next[key] = (index + 1) % len(answers)
+            self.hits += 1
+            response, delay = answers[index]
+            if self.latency == "none":
+                delay = 0.0
+            elif self.latency == "sampled":
+                delay = self._rng.choice(self._latencies)
+        return response, delay
+    
+    def create(self, **kwargs):
+        """Replay a chat completion request"""
+        response, delay = self._answer(kwargs)
+        if delay:
+            time.sleep(delay)
+        return response
+    
+    async def acreate(self, **kwargs):
+        """Replay a chat completion request from a coroutine"""
+        response, delay = self._answer(kwargs)
+        if delay:
+            await asyncio.sleep(delay)
+        return response
+    
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "recorded_calls": len(self._latencies),
+            "mean_recorded_latency": sum(self._latencies) / len(self._latencies) if self._latencies else 0.0,
+        }
@@ -15,7 +15,7 @@ class PlayerAgent(Player):
         dealer_value = dealer_up_card.get_value()
         
         # If we have an Ace (soft hand)
-        has_ace = any(card.rank.value == 1 for card in self.hand.cards)
+        has_ace = self.hand.num_aces > 0
         if has_ace and player_value <= 21:
             return self._decide_soft_hand(player_value, dealer_value)
         
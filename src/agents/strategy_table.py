@@ -0,0 +1,92 @@
+import struct
+from typing import Tuple
+from ..models.card import Card, Suit, Rank
+from ..models.hand import Hand
+
+# Table axes: hand value (0-21), hand holds an ace (0/1), dealer up card value (1-10)
+TABLE_SHAPE: Tuple[int, int, int] = (22, 2, 11)
+
+_MAGIC = b"BJST"
+_HEADER = struct.Struct("<4sBBB")
+
+class StrategyTable:
+    """
+    Dense hit/stand table over (hand value, holds an ace, dealer up card value).
+    Actions are stored as the bytes b'H' / b'S', flattened in C order.
+    Cells that cannot occur (bust totals, ace hands below 12) default to stand.
+    """
+    def __init__(self, actions: bytes = None):
+        size = TABLE_SHAPE[0] * TABLE_SHAPE[1] * TABLE_SHAPE[2]
+        if actions is None:
+            actions = b'S' * size
+        if len(actions) != size:
+            raise ValueError(f"Strategy table needs {size} actions, got {len(actions)}")
+        self.actions = bytes(actions)
+    
+    @staticmethod
+    def index(total: int, has_ace: bool, dealer_value: int) -> int:
+        """Flat index of a table cell"""
+        return (total * 2 + has_ace) * TABLE_SHAPE[2] + dealer_value
+    
+    def action(self, total: int, has_ace: bool, dealer_value: int) -> str:
+        """Look up the action for a state: 'H' for hit, 'S' for stand"""
+        if total > 21:
+            return 'S'
+        return chr(self.actions[self.index(total, has_ace, dealer_value)])
+    
+    @classmethod
+    def compile(cls, agent) -> "StrategyTable":
+        """
+        Compile a fixed-strategy agent into a table by asking it once per state.
+        The agent's decision must depend only on its hand value, whether the
+        hand holds an ace and the dealer up card, as for PlayerAgent.
+        """
+        actions = bytearray(b'S' * (TABLE_SHAPE[0] * TABLE_SHAPE[1] * TABLE_SHAPE[2]))
+        saved_hand = agent.hand
+        try:
+            for dealer_value in range(1, 11):
+                up_card = Card(Suit.HEARTS, Rank(dealer_value))
+                for total in range(4, 22):
+                    for has_ace in (0, 1):
+                        if has_ace and total < 12:
+                            continue  # A hand holding an ace is worth at least 12
+                        agent.hand = representative_hand(total, has_ace)
+                        action = agent.decide_action(up_card)
+                        actions[cls.index(total, has_ace, dealer_value)] = ord(action)
+        finally:
+            agent.hand = saved_hand
+        return cls(bytes(actions))
+    
+    def save(self, path: str):
+        """Write the table as a small binary file"""
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, *TABLE_SHAPE))
+            f.write(self.actions)
+    
+    @classmethod
+    def load(cls, path: str) -> "StrategyTable":
+        """Read a table written by save()"""
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, *shape = _HEADER.unpack_from(data)
+        if magic != _MAGIC or tuple(shape) != TABLE_SHAPE:
+            raise ValueError(f"{path} is not a strategy table file")
+        return cls(data[_HEADER.size:])
+
+def representative_hand(total: int, has_ace: int) -> Hand:
+    """
+    Build a representative hand with the given value (an ace counted as 11
+    when has_ace), for asking agents or the EV solver about a table cell
+    """
+    if has_ace:
+        ranks = [1, total - 11] if total > 12 else [1, 1]
+    elif total <= 11:
+        ranks = [2, total - 2]
+    elif total <= 20:
+        ranks = [10, total - 10]
+    else:
+        ranks = [10, 9, 2]
+    hand = Hand()
+    for rank in ranks:
+        hand.add_card(Card(Suit.SPADES, Rank(rank)))
+    return hand
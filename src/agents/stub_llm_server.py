@@ -0,0 +1,102 @@
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Dict, List, Set, Tuple
+
+# Per-message overhead the chat format adds, as in OpenAI's token accounting
+TOKENS_PER_MESSAGE = 4
+
+def _message_tokens(message: Dict[str, str]) -> int:
+    # One token per character: a rough stand-in for a tokenizer, close for Chinese text
+    return TOKENS_PER_MESSAGE + len(message.get("content") or "")
+
+class _StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    # Message prefixes seen so far, shared by the server's handler threads
+    prefixes: Set[str] = set()
+    prefixes_lock = Lock()
+    
+    def _usage(self, messages: List[Dict[str, str]], content: str) -> Dict:
+        """
+        Estimated usage with a prompt cache at message granularity: the
+        longest run of leading messages some earlier request also started
+        with counts as cached. Unlike a real provider there is no minimum
+        cacheable length, so short prompts show their cacheable share too.
+        """
+        keys = [json.dumps(messages[:i], sort_keys=True) for i in range(1, len(messages) + 1)]
+        with self.prefixes_lock:
+            cached_messages = next((i for i in range(len(keys), 0, -1) if keys[i - 1] in self.prefixes), 0)
+            self.prefixes.update(keys)
+        prompt_tokens = sum(_message_tokens(message) for message in messages)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(content),
+            "total_tokens": prompt_tokens + len(content),
+            "prompt_tokens_details": {
+                "cached_tokens": sum(_message_tokens(message) for message in messages[:cached_messages]),
+            },
+        }
+    
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        time.sleep(self.latency)
+        
+        if request.get("response_format", {}).get("type") == "json_object":
+            # Batched queries: answer every id in the last user message
+            queries = json.loads(request["messages"][-1]["content"])["queries"]
+            content = json.dumps({"answers": {
+                str(query["id"]): "S" if query["type"] == "action" else "50" for query in queries
+            }})
+        else:
+            # One-token requests are hit/stand decisions, the rest are bets
+            content = "S" if request.get("max_tokens") == 1 else "50"
+        body = json.dumps({
+            "id": "stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": self._usage(request.get("messages", []), content),
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0,
+                      latency: float = 0.0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start an OpenAI-compatible chat completions stub in a background thread
+    that answers every request after a fixed latency and reports estimated
+    token usage, including prompt-cache hits on repeated message prefixes.
+    Returns: the server and the base_url to hand to the agents
+    """
+    handler = type("StubHandler", (_StubHandler,), {"latency": latency, "prefixes": set()})
+    server = ThreadingHTTPServer((host, port), handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stub for the chat completions API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per request")
+    args = parser.parse_args()
+    server, base_url = start_stub_server(args.host, args.port, args.latency)
+    print(f"Stub LLM server listening on {base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,25 @@
+from .basic_player_agent import BasicPlayerAgent
+from .strategy_table import StrategyTable
+from ..models.card import Card
+
+class TableAgent(BasicPlayerAgent):
+    """
+    Player that decides hit/stand with a single lookup into a precompiled
+    StrategyTable; betting follows BasicPlayerAgent
+    """
+    def __init__(self, table: StrategyTable, name: str = "Table Player"):
+        super().__init__(name)
+        self.table = table
+    
+    @classmethod
+    def from_file(cls, path: str, name: str = "Table Player") -> "TableAgent":
+        """Create an agent from a table saved with StrategyTable.save()"""
+        return cls(StrategyTable.load(path), name)
+    
+    def decide_action(self, dealer_up_card: Card) -> str:
+        """
+        Look up the action for the current state
+        Returns: 'H' for hit, 'S' for stand
+        """
+        hand = self.hand
+        return self.table.action(hand.get_value(), hand.num_aces > 0, dealer_up_card.get_value())
@@ -0,0 +1,85 @@
+import asyncio
+import inspect
+import random
+import time
+from typing import Dict, List, Optional
+from .game_engine import GameEngine
+from ..agents.async_dealer_agent import AsyncDealerAgent
+from ..agents.dealer_agent import API_BASE_URL, API_KEY
+from ..models.dealer import Dealer
+
+async def _resolve(value):
+    """Await decisions from async agents, pass through those of local agents"""
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+class AsyncGameEngine(GameEngine):
+    """
+    GameEngine driven by asyncio. Betting calls for all players are issued
+    concurrently; hit/stand decisions stay sequential because each one depends
+    on the cards drawn before it. Sync and async agents can be mixed.
+    """
+    def __init__(self, use_ai_dealer: bool = True, rng: Optional[random.Random] = None,
+                 base_url: str = API_BASE_URL, api_key: str = API_KEY,
+                 dealer: Optional[Dealer] = None, event_sink=None,
+                 num_decks: int = 1, penetration: float = 0.75, tracer=None):
+        super().__init__(use_ai_dealer=False, rng=rng, dealer=dealer, event_sink=event_sink,
+                         num_decks=num_decks, penetration=penetration, tracer=tracer)
+        if use_ai_dealer and dealer is None:
+            self.dealer = AsyncDealerAgent(base_url, api_key)
+    
+    async def _handle_bets_async(self, verbose: bool = False) -> Dict[str, int]:
+        """Handle betting phase for all players, asking them all at once"""
+        decisions = await asyncio.gather(*(_resolve(player.decide_bet()) for player in self.players))
+        return self._place_bets(decisions, verbose)
+    
+    async def play_round(self, verbose: bool = False) -> Dict[str, str]:
+        """
+        Play a complete round with all players; the same steps as
+        GameEngine.play_round, awaiting the decisions in between
+        Returns: Dictionary mapping player names to their results
+        """
+        tracer = self.tracer
+        phase_start = time.perf_counter() if tracer is not None else 0.0
+        
+        bets = self.bets = await self._handle_bets_async(verbose)
+        phase_start = self._end_bets(phase_start, verbose)
+        
+        for player in self.players:
+            self._start_turn(player, verbose)
+            while True:
+                decision_start = time.perf_counter() if tracer is not None else 0.0
+                action = await _resolve(player.decide_action(self.dealer.hand.cards[0]))
+                if self._apply_action(player, action, decision_start, verbose):
+                    break
+        
+        phase_start = self._start_dealer_turn(phase_start, verbose)
+        while await _resolve(self.dealer.should_hit()):
+            self._dealer_hit(verbose)
+        
+        return self._finish_round(bets, phase_start, verbose)
+    
+    def _counter_sources(self) -> List:
+        """Players and dealer, plus the batch dispatchers that send the players' requests"""
+        sources = super()._counter_sources()
+        for player in self.players:
+            dispatcher = getattr(player, "dispatcher", None)
+            if dispatcher is not None and all(dispatcher is not seen for seen in sources):
+                sources.append(dispatcher)
+        return sources
+
+async def play_tables(engines: List[AsyncGameEngine], num_rounds: int) -> List[List[Dict[str, str]]]:
+    """
+    Play num_rounds rounds on every table concurrently, so one table's
+    requests are in flight while the others wait on theirs
+    Returns: per-table list of round results
+    """
+    async def play_table(engine: AsyncGameEngine) -> List[Dict[str, str]]:
+        results = []
+        for _ in range(num_rounds):
+            engine.start_round()
+            results.append(await engine.play_round())
+        return results
+    
+    return list(await asyncio.gather(*(play_table(engine) for engine in engines)))
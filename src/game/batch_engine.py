@@ -0,0 +1,148 @@
+import numpy as np
+from typing import Dict, Optional, Union
+from ..models.card import CARD_VALUES, NUM_CODES
+from ..agents.player_agent import PlayerAgent
+from ..agents.strategy_table import StrategyTable, TABLE_SHAPE
+from ..models.rng import derive_seed
+
+# Outcome codes, indexing into OUTCOMES
+WIN, LOSE, PUSH, BUST = range(4)
+OUTCOMES = ("WIN", "LOSE", "PUSH", "BUST")
+
+_CARD_VALUES = np.array(CARD_VALUES, dtype=np.int8)
+
+def _hand_value(hard: np.ndarray, aces: np.ndarray) -> np.ndarray:
+    """Vectorized Hand.get_value: one ace counts as 11 when it does not bust"""
+    return hard + 10 * ((aces > 0) & (hard <= 11))
+
+def numpy_rng(root_seed: int, *path: int) -> np.random.Generator:
+    """Counter-based NumPy stream (Philox) for a seed path, see derive_seed"""
+    return np.random.Generator(np.random.Philox(key=derive_seed(root_seed, *path)))
+
+def deal_shoes(num_shoes: int, rng: Optional[np.random.Generator] = None,
+               num_decks: int = 1) -> np.ndarray:
+    """Return a (num_shoes, 52 * num_decks) array of independently shuffled card codes"""
+    if rng is None:
+        rng = np.random.default_rng()
+    # Sorting random keys is faster than Generator.permuted for many short rows
+    order = rng.random((num_shoes, NUM_CODES * num_decks)).argsort(axis=1)
+    return (order % NUM_CODES).astype(np.int8)
+
+class BatchEngine:
+    """
+    Vectorized single-seat simulator for fixed-strategy agents.
+
+    Each row of a shoe array is one round dealt from the top of that shoe in
+    the same order as GameEngine (player, dealer, player, dealer, then the
+    player's hits and the dealer's draws), so a row replayed through
+    GameEngine with a one-player table (game.deck = Deck(row)) gives the same outcome.
+    Bets are flat: agents' chip-dependent bet sizing is inherently sequential.
+    """
+    def __init__(self, strategy: Union[PlayerAgent, StrategyTable], bet: int = 10):
+        if not isinstance(strategy, StrategyTable):
+            strategy = StrategyTable.compile(strategy)
+        actions = np.frombuffer(strategy.actions, dtype=np.uint8).reshape(TABLE_SHAPE)
+        self.hit_table = actions == ord('H')
+        self.bet = bet
+    
+    def play(self, shoes: np.ndarray,
+             bets: Optional[Union[int, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+        """
+        Play one round per shoe row
+        Returns: outcome codes, chip deltas and final totals per hand
+        """
+        if bets is None:
+            bets = self.bet
+        values = _CARD_VALUES[shoes].astype(np.int16)
+        rows = np.arange(len(shoes))
+        
+        player_hard = values[:, 0] + values[:, 2]
+        player_aces = (values[:, 0] == 1).astype(np.int16) + (values[:, 2] == 1)
+        dealer_hard = values[:, 1] + values[:, 3]
+        dealer_aces = (values[:, 1] == 1).astype(np.int16) + (values[:, 3] == 1)
+        up = values[:, 1]
+        cursor = np.full(len(shoes), 4)
+        
+        player_value = _hand_value(player_hard, player_aces)
+        player_blackjack = player_value == 21
+        dealer_blackjack = _hand_value(dealer_hard, dealer_aces) == 21
+        
+        # Players' turns
+        active = np.ones(len(shoes), dtype=bool)
+        while active.any():
+            hit = active & self.hit_table[np.minimum(player_value, 21), (player_aces > 0).astype(np.intp), up]
+            idx = rows[hit]
+            card = values[idx, cursor[idx]]
+            player_hard[idx] += card
+            player_aces[idx] += card == 1
+            cursor[idx] += 1
+            player_value = _hand_value(player_hard, player_aces)
+            active = hit & (player_value <= 21)
+        player_blackjack &= cursor == 4
+        
+        # Dealer's turn
+        dealer_value = _hand_value(dealer_hard, dealer_aces)
+        drawing = dealer_value < 17
+        while drawing.any():
+            idx = rows[drawing]
+            card = values[idx, cursor[idx]]
+            dealer_hard[idx] += card
+            dealer_aces[idx] += card == 1
+            cursor[idx] += 1
+            dealer_value = _hand_value(dealer_hard, dealer_aces)
+            drawing = dealer_value < 17
+        
+        # Results, in the same precedence as GameEngine._get_game_result
+        outcome = np.select(
+            [
+                player_value > 21,
+                dealer_value > 21,
+                player_blackjack & ~dealer_blackjack,
+                dealer_blackjack & ~player_blackjack,
+                player_blackjack & dealer_blackjack,
+                player_value > dealer_value,
+                player_value < dealer_value,
+            ],
+            [BUST, WIN, WIN, LOSE, PUSH, WIN, LOSE],
+            default=PUSH,
+        ).astype(np.int8)
+        
+        bets = np.broadcast_to(np.asarray(bets, dtype=np.int64), outcome.shape)
+        win_amount = np.where(player_blackjack, bets * 3 // 2, bets)
+        delta = np.select([outcome == WIN, outcome == PUSH], [win_amount, 0], default=-bets)
+        
+        return {
+            "outcome": outcome,
+            "delta": delta,
+            "player_value": player_value,
+            "dealer_value": dealer_value,
+        }
+    
+    def simulate(self, num_hands: int, rng: Optional[np.random.Generator] = None,
+                 batch_size: int = 1_000_000, seed: Optional[int] = None) -> Dict[str, Union[int, float]]:
+        """
+        Play num_hands rounds in batches of freshly shuffled shoes.
+        With a seed, batch k is dealt from numpy_rng(seed, k), so any batch
+        can be regenerated on its own to replay its hands.
+        Returns: outcome counts, total chip delta and mean delta per hand
+        """
+        if rng is None and seed is None:
+            rng = np.random.default_rng()
+        counts = np.zeros(len(OUTCOMES), dtype=np.int64)
+        total_delta = 0
+        remaining = num_hands
+        batch = 0
+        while remaining > 0:
+            size = min(batch_size, remaining)
+            batch_rng = numpy_rng(seed, batch) if seed is not None else rng
+            result = self.play(deal_shoes(size, batch_rng))
+            counts += np.bincount(result["outcome"], minlength=len(OUTCOMES))
+            total_delta += int(result["delta"].sum())
+            remaining -= size
+            batch += 1
+        
+        stats = {name: int(count) for name, count in zip(OUTCOMES, counts)}
+        stats["hands"] = num_hands
+        stats["total_delta"] = total_delta
+        stats["mean_delta"] = total_delta / num_hands if num_hands else 0.0
+        return stats
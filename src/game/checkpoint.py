@@ -0,0 +1,74 @@
+import json
+import os
+import pickle
+from typing import Dict, List, Optional
+
+MANIFEST = "manifest.json"
+
+def _write_atomic(path: str, data: bytes):
+    """Write via a temporary file and rename, so a crash never leaves a torn file"""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def save_snapshot(path: str, snapshot: Dict):
+    """Atomically replace the snapshot at path"""
+    _write_atomic(path, pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL))
+
+def load_snapshot(path: str) -> Optional[Dict]:
+    """The snapshot saved at path, or None if there is none"""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+class ShardCheckpoint:
+    """
+    Directory of finished shard results for one run. Each result is pickled
+    to its own file as soon as the shard completes; a manifest records the
+    fingerprint of the config that produced them, so a resume with different
+    settings is refused instead of mixing results. Round-level snapshots of
+    unfinished tables (table_NNNNN.snap) live in the same directory.
+    """
+    def __init__(self, path: str, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+    
+    def _shard_path(self, shard_id: int) -> str:
+        return os.path.join(self.path, f"shard_{shard_id:05d}.pkl")
+    
+    def start(self, resume: bool = False) -> List[Dict]:
+        """
+        Prepare the directory for a run
+        Returns: the results saved by an earlier run when resuming, else []
+        """
+        os.makedirs(self.path, exist_ok=True)
+        manifest_path = os.path.join(self.path, MANIFEST)
+        if resume and os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest["fingerprint"] != self.fingerprint:
+                raise ValueError(f"Checkpoint in {self.path} was written by a different config")
+            return self.load()
+        
+        for name in os.listdir(self.path):
+            if name.endswith((".pkl", ".snap")):
+                os.remove(os.path.join(self.path, name))
+        _write_atomic(manifest_path, json.dumps({"fingerprint": self.fingerprint}).encode())
+        return []
+    
+    def save(self, result: Dict):
+        """Persist one finished shard"""
+        _write_atomic(self._shard_path(result["shard_id"]), pickle.dumps(result))
+    
+    def load(self) -> List[Dict]:
+        """All saved shard results, ordered by shard id"""
+        results = []
+        for name in sorted(os.listdir(self.path)):
+            if name.startswith("shard_") and name.endswith(".pkl"):
+                with open(os.path.join(self.path, name), "rb") as f:
+                    results.append(pickle.load(f))
+        return results
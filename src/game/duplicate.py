@@ -0,0 +1,117 @@
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Callable, Dict, List, Optional
+from .game_engine import GameEngine
+from .stats_aggregator import PlayerStats
+from ..models.card import Card
+from ..models.player import Player
+from ..models.rng import make_rng
+
+# Two-sided 95% normal quantile for the confidence intervals
+Z_95 = 1.959963984540054
+
+class DuplicateGameEngine(GameEngine):
+    """
+    Single-seat table for duplicate-deal comparisons. Every round is dealt
+    from a freshly shuffled shoe, so engines created with the same seed see
+    the same cards round after round whatever their players do. The initial
+    deal and the player's hits come off the front of the shoe; the dealer's
+    hits come off the back, so the dealer's draws do not shift when another
+    agent would have hit a different number of times.
+    """
+    def __init__(self, rng: random.Random, dealer=None, num_decks: int = 1, event_sink=None):
+        super().__init__(use_ai_dealer=False, rng=rng, dealer=dealer, event_sink=event_sink,
+                         num_decks=num_decks, penetration=1.0)
+    
+    def start_round(self):
+        """Reshuffle the whole shoe and deal a new round"""
+        self.deck.reshuffle()
+        super().start_round()
+    
+    def _draw_dealer_card(self) -> Card:
+        return self.deck.draw_back_card()
+
+def interval(stats: PlayerStats) -> Dict[str, float]:
+    """Mean chip delta (or paired difference) per round with its 95% CI"""
+    return {
+        "rounds": stats.rounds,
+        "mean": stats.mean,
+        "stderr": stats.stderr,
+        "ci_low": stats.mean - Z_95 * stats.stderr,
+        "ci_high": stats.mean + Z_95 * stats.stderr,
+    }
+
+def play_duplicate_shard(shard_id: int, start_round: int, num_rounds: int, seed: int,
+                         make_players: Callable[[], List[Player]], num_decks: int = 1) -> Dict:
+    """
+    Play num_rounds duplicate rounds: each player sits alone at its own
+    engine, all engines seeded alike. Chips are reset before every round so
+    the rounds are independent, paired trials. Rounds are numbered from
+    start_round so the stats of all shards merge cleanly.
+    Returns: PlayerStats per agent, and per pair of agents for the
+    difference of their deltas (chips left at 0, only the moments count)
+    """
+    players = make_players()
+    engines = []
+    for player in players:
+        engine = DuplicateGameEngine(make_rng(seed, shard_id), num_decks=num_decks)
+        engine.add_player(player)
+        engines.append(engine)
+    
+    names = [player.name for player in players]
+    agents = {name: PlayerStats(max_samples=1) for name in names}
+    pairs = {(a, b): PlayerStats(max_samples=1) for a, b in combinations(names, 2)}
+    for round_num in range(start_round, start_round + num_rounds):
+        deltas = {}
+        for player, engine in zip(players, engines):
+            player.chips = initial = 1000
+            engine.dealer.chips = 5000
+            engine.start_round()
+            result = engine.play_round()[player.name]
+            deltas[player.name] = player.chips - initial
+            blackjack = result == "WIN" and player.hand.is_blackjack()
+            agents[player.name].update(round_num, player.chips, deltas[player.name], result, blackjack,
+                                       engine.bets.get(player.name, 0))
+        for (a, b), difference in pairs.items():
+            difference.update(round_num, 0, deltas[a] - deltas[b])
+    return {"shard_id": shard_id, "agents": agents, "pairs": pairs}
+
+def run_duplicate(make_players: Callable[[], List[Player]], num_rounds: int, seed: int = 0,
+                  num_decks: int = 1, num_shards: int = 1, num_workers: Optional[int] = None) -> Dict:
+    """
+    Compare agents on identical deals, split over num_shards worker processes.
+    make_players must be picklable and return the same agents (by name) every call.
+    Returns: {"agents": {name: summary}, "pairs": {(a, b): summary}} where a
+    pair summary is the mean of delta_a - delta_b per round with its 95% CI,
+    plus "unpaired_stderr", the standard error the same rounds would give if
+    the agents had been dealt independent cards
+    """
+    base, extra = divmod(num_rounds, num_shards)
+    with ProcessPoolExecutor(max_workers=num_workers or min(num_shards, os.cpu_count() or 1)) as executor:
+        futures = [
+            executor.submit(play_duplicate_shard, shard_id, shard_id * base + min(shard_id, extra),
+                            base + (1 if shard_id < extra else 0), seed, make_players, num_decks)
+            for shard_id in range(num_shards)
+        ]
+        results = [future.result() for future in futures]
+    
+    agents, pairs = results[0]["agents"], results[0]["pairs"]
+    for result in results[1:]:
+        for name, stats in result["agents"].items():
+            agents[name].merge(stats)
+        for key, stats in result["pairs"].items():
+            pairs[key].merge(stats)
+    
+    report = {"agents": {}, "pairs": {}}
+    for name, stats in agents.items():
+        # Chips are reset every round, so only the per-round figures mean anything
+        report["agents"][name] = {**interval(stats), "return_per_chip": stats.return_per_chip, **stats.outcomes}
+    for (a, b), stats in pairs.items():
+        summary = interval(stats)
+        if stats.rounds:
+            summary["unpaired_stderr"] = math.sqrt((agents[a].variance + agents[b].variance) / stats.rounds)
+        report["pairs"][(a, b)] = summary
+    return report
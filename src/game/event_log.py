@@ -0,0 +1,88 @@
+import struct
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Event kinds
+BET, DEAL, ACTION, RESULT, PAYOUT = range(5)
+EVENT_KINDS = ("BET", "DEAL", "ACTION", "RESULT", "PAYOUT")
+
+# Seat number used for the dealer
+DEALER_SEAT = 255
+
+# RESULT values, same order as batch_engine.OUTCOMES
+RESULT_CODES = {"WIN": 0, "LOSE": 1, "PUSH": 2, "BUST": 3}
+
+# Fixed-width little-endian record:
+# round (u32), table (u16), seat (u8), kind (u8), value (i32)
+#   BET: amount, DEAL: card code, ACTION: ord('H') / ord('S'),
+#   RESULT: RESULT_CODES value, PAYOUT: chip delta for the player
+_RECORD = struct.Struct("<IHBBi")
+EVENT_FIELDS = [
+    ("round", "<u4"),
+    ("table", "<u2"),
+    ("seat", "u1"),
+    ("kind", "u1"),
+    ("value", "<i4"),
+]
+
+def __getattr__(name: str):
+    # EVENT_DTYPE is built on first access so the engine can use the event
+    # constants without importing numpy
+    if name == "EVENT_DTYPE":
+        import numpy as np
+        return np.dtype(EVENT_FIELDS)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class EventLog:
+    """
+    Streaming sink for round events. Records are packed into a fixed-size
+    buffer and appended to a binary file one chunk at a time, so memory stays
+    bounded however long the run. Read the file back with read_events().
+    """
+    def __init__(self, path: str, table_id: int = 0, chunk_records: int = 65536, append: bool = False):
+        self.path = path
+        self.table_id = table_id
+        self.chunk_records = chunk_records
+        self._buffer = bytearray(chunk_records * _RECORD.size)
+        self._count = 0
+        self._file = open(path, "ab" if append else "wb")
+        self.records_written = 0
+    
+    def record(self, round_number: int, seat: int, kind: int, value: int):
+        """Append one event"""
+        _RECORD.pack_into(self._buffer, self._count * _RECORD.size,
+                          round_number, self.table_id, seat, kind, value)
+        self._count += 1
+        if self._count == self.chunk_records:
+            self.flush()
+    
+    def flush(self):
+        """Write buffered events to the file"""
+        if self._count:
+            self._file.write(memoryview(self._buffer)[:self._count * _RECORD.size])
+            self.records_written += self._count
+            self._count = 0
+        self._file.flush()
+    
+    def tell(self) -> int:
+        """Size of the file in bytes once buffered events are flushed"""
+        return self._file.tell() + self._count * _RECORD.size
+    
+    def close(self):
+        """Flush and close the file"""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+    
+    def __enter__(self) -> "EventLog":
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def read_events(path: str, mode: Optional[str] = "r") -> "np.ndarray":
+    """Memory-map an event log as a structured array with EVENT_DTYPE fields"""
+    import numpy as np
+    return np.memmap(path, dtype=np.dtype(EVENT_FIELDS), mode=mode)
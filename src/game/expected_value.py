@@ -0,0 +1,261 @@
+import numpy as np
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple, Union
+from ..models.card import Card, Rank
+from ..models.deck import Deck
+from ..models.hand import Hand
+from ..agents.strategy_table import StrategyTable, representative_hand
+
+# Composition: remaining card counts by Blackjack value, index 0 = ace ... index 9 = ten-valued
+Composition = Tuple[int, ...]
+
+# Dealer final outcomes, in the order of the rows returned by _dealer_outcome_batch
+DEALER_OUTCOMES = ("17", "18", "19", "20", "21", "BLACKJACK", "BUST")
+_BLACKJACK = 5
+_BUST = 6
+
+SINGLE_DECK: Composition = (4, 4, 4, 4, 4, 4, 4, 4, 4, 16)
+
+def rank_composition(ranks: Dict[Rank, int]) -> Composition:
+    """Fold per-Rank counts into a composition by Blackjack value"""
+    counts = [0] * 10
+    for rank, count in ranks.items():
+        counts[min(rank.value, 10) - 1] += count
+    return tuple(counts)
+
+def deck_composition(deck: Deck) -> Composition:
+    """
+    Composition of the cards a player at the Deck's table has not seen: the
+    undealt cards plus the dealer's face-down hole card
+    """
+    counts = [0] * 10
+    for index, count in enumerate(deck.view.rank_counts):  # Indexed by rank.value - 1
+        counts[min(index, 9)] += count
+    return tuple(counts)
+
+def _remove(composition: Composition, value: int) -> Composition:
+    counts = list(composition)
+    counts[value - 1] -= 1
+    return tuple(counts)
+
+def _value(hard: int, has_ace: bool) -> int:
+    return hard + 10 if has_ace and hard <= 11 else hard
+
+@lru_cache(maxsize=10)  # One entry per up card
+def _dealer_draws(up_value: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Every way the dealer can finish from an up card, grouped by the multiset of
+    cards drawn. The probability of a draw sequence without replacement only
+    depends on that multiset, so one table per up card serves every composition.
+    Returns: drawn counts by value (M x 10), outcome index (M), number of orderings (M)
+    """
+    groups: Dict[Tuple[Tuple[int, ...], int], int] = {}
+    counts = [0] * 10
+    
+    def draw(hard: int, has_ace: bool, num_cards: int):
+        value = _value(hard, has_ace)
+        if value > 21:
+            outcome = _BUST
+        elif num_cards == 2 and value == 21:
+            outcome = _BLACKJACK
+        elif value >= 17 and num_cards >= 2:
+            outcome = value - 17
+        else:
+            for card_value in range(1, 11):
+                counts[card_value - 1] += 1
+                draw(hard + card_value, has_ace or card_value == 1, num_cards + 1)
+                counts[card_value - 1] -= 1
+            return
+        key = (tuple(counts), outcome)
+        groups[key] = groups.get(key, 0) + 1
+    
+    draw(up_value, up_value == 1, 1)
+    drawn = np.array([key[0] for key in groups], dtype=np.intp)
+    outcomes = np.array([key[1] for key in groups], dtype=np.intp)
+    orderings = np.array(list(groups.values()), dtype=float)
+    return drawn, outcomes, orderings
+
+# Log-probability standing in for log(0), finite so indicator products stay exact
+_IMPOSSIBLE = -1e6
+# Compositions per matrix product, bounds the compositions x multisets intermediates
+_CHUNK = 512
+
+def _log_factorials(n: int) -> np.ndarray:
+    """table[i] = log(i!) for i in 0..n"""
+    return np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, n + 1)))))
+
+def _dealer_outcome_batch(up_value: int, compositions: List[Composition]) -> np.ndarray:
+    """
+    Dealer outcome probabilities for many compositions at once, one row per
+    composition in DEALER_OUTCOMES order.
+    log P(multiset) = log orderings + sum_v log ff(count_v, drawn_v) - log ff(total, cards drawn);
+    the sums are a single matrix product between indicators of each
+    composition's count per value and total, and the log falling factorials
+    of every multiset.
+    """
+    drawn, outcomes, orderings = _dealer_draws(up_value)
+    counts = np.array(compositions, dtype=np.intp)
+    totals = counts.sum(axis=1)
+    log_fact = _log_factorials(int(totals.max()))
+    num_drawn = drawn.sum(axis=1)
+    # One indicator column per distinct (value, count) and per distinct total in
+    # the batch; its row holds that term's log falling factorial for every multiset
+    indicators, log_ff = [], []
+    for v in range(10):
+        levels, index = np.unique(counts[:, v], return_inverse=True)
+        indicators.append(np.eye(len(levels))[index])
+        n, k = levels[:, None], drawn[None, :, v]
+        log_ff.append(np.where(k <= n, log_fact[n] - log_fact[np.maximum(n - k, 0)], _IMPOSSIBLE))
+    levels, index = np.unique(totals, return_inverse=True)
+    indicators.append(np.eye(len(levels))[index])
+    n, k = levels[:, None], num_drawn[None, :]
+    log_ff.append(np.where(k <= n, log_fact[np.maximum(n - k, 0)] - log_fact[n], 0.0))
+    indicators = np.hstack(indicators)
+    log_ff = np.vstack(log_ff)
+    log_orderings = np.log(orderings)
+    by_outcome = np.eye(len(DEALER_OUTCOMES))[outcomes]
+    
+    result = np.empty((len(compositions), len(DEALER_OUTCOMES)))
+    for start in range(0, len(compositions), _CHUNK):
+        chunk = slice(start, start + _CHUNK)
+        result[chunk] = np.exp(indicators[chunk] @ log_ff + log_orderings) @ by_outcome
+    return result
+
+def dealer_distribution(up_value: int, composition: Composition) -> Dict[str, float]:
+    """
+    Distribution of the dealer's final result for an up card (1 = ace),
+    drawing the hole card and any hits from composition
+    """
+    return dict(zip(DEALER_OUTCOMES, _dealer_outcome_batch(up_value, [composition])[0].tolist()))
+
+class _Solver:
+    """
+    Hit/stand EVs against one dealer up card. Dealer outcomes and player
+    states are memoized for the solver's lifetime only (one action_evs call,
+    or one up card of a table check), so memory does not grow across calls.
+    """
+    def __init__(self, up_value: int):
+        self.up_value = up_value
+        self._outcomes: Dict[Composition, Tuple[float, ...]] = {}
+        self._best: Dict[Tuple[int, bool, Composition], float] = {}
+        self._walked: Set[Tuple[int, bool, Composition]] = set()  # States whose subtree is prepared
+    
+    def prepare(self, roots: List[Tuple[int, bool, Composition]]):
+        """
+        Compute, in one batch, the dealer outcomes of every composition the
+        (hard total, has ace, composition) roots can stand on. States already
+        walked, by this or an earlier call, are skipped with everything below them.
+        """
+        pending = set()
+        walked = self._walked
+        stack = list(roots)
+        while stack:
+            state = stack.pop()
+            if state in walked:
+                continue
+            walked.add(state)
+            hard, has_ace, composition = state
+            if composition not in self._outcomes:
+                pending.add(composition)
+            # A hand busts exactly when its hard total passes 21
+            for card_value in range(1, min(10, 21 - hard) + 1):
+                if composition[card_value - 1]:
+                    stack.append((hard + card_value, has_ace or card_value == 1,
+                                  _remove(composition, card_value)))
+        if pending:
+            pending = list(pending)
+            for composition, row in zip(pending, _dealer_outcome_batch(self.up_value, pending).tolist()):
+                self._outcomes[composition] = tuple(row)
+    
+    def stand_ev(self, player_value: int, composition: Composition) -> float:
+        outcome = self._outcomes[composition]
+        ev = outcome[_BUST] - outcome[_BLACKJACK]
+        for dealer_value, p in zip(range(17, 22), outcome):
+            if player_value > dealer_value:
+                ev += p
+            elif player_value < dealer_value:
+                ev -= p
+        return ev
+    
+    def best_ev(self, hard: int, has_ace: bool, composition: Composition) -> float:
+        """EV of a non-bust player hand under optimal hit/stand play"""
+        key = (hard, has_ace, composition)
+        ev = self._best.get(key)
+        if ev is None:
+            ev = self._best[key] = max(self.stand_ev(_value(hard, has_ace), composition),
+                                       self.hit_ev(hard, has_ace, composition))
+        return ev
+    
+    def hit_ev(self, hard: int, has_ace: bool, composition: Composition) -> float:
+        total = sum(composition)
+        safe = min(10, 21 - hard)  # Card values that don't bust the hand
+        ev = -sum(composition[safe:]) / total
+        for card_value in range(1, safe + 1):
+            count = composition[card_value - 1]
+            if count:
+                ev += count / total * self.best_ev(hard + card_value, has_ace or card_value == 1,
+                                                   _remove(composition, card_value))
+        return ev
+    
+    def action_evs(self, hand: Hand, composition: Composition) -> Dict[str, float]:
+        has_ace = hand.num_aces > 0
+        self.prepare([(hand.hard_value, has_ace, composition)])
+        return {
+            'S': self.stand_ev(hand.get_value(), composition),
+            'H': self.hit_ev(hand.hard_value, has_ace, composition),
+        }
+
+def action_evs(hand: Hand, dealer_up_card: Card,
+               composition: Union[Composition, Deck]) -> Dict[str, float]:
+    """
+    Exact expected value, in units of the bet, of standing ('S') and of hitting
+    and then playing optimally ('H'). composition is the shoe the player has
+    not seen (the dealer's hole card included), e.g. the Deck the hand was
+    dealt from. Player blackjack payouts are not part of a hit/stand decision
+    and are ignored.
+    """
+    if isinstance(composition, Deck):
+        composition = deck_composition(composition)
+    return _Solver(dealer_up_card.get_value()).action_evs(hand, composition)
+
+def check_strategy(table: StrategyTable,
+                   composition: Optional[Composition] = None) -> List[Dict[str, Union[int, str, float]]]:
+    """
+    Compare every table cell with the EV-optimal action, using the same
+    representative hands as StrategyTable.compile with its cards and the dealer
+    up card removed from composition (default: a full single deck)
+    Returns: the cells whose action loses EV, largest loss first
+    """
+    if composition is None:
+        composition = SINGLE_DECK
+    mistakes = []
+    for up_value in range(1, 11):
+        # One solver per up card: the cells share most of their compositions,
+        # so their dealer outcomes are computed together in one batch
+        solver = _Solver(up_value)
+        cells = []
+        for total in range(4, 22):
+            for has_ace in (0, 1):
+                if has_ace and total < 12:
+                    continue
+                hand = representative_hand(total, has_ace)
+                remaining = _remove(composition, up_value)
+                for card in hand.cards:
+                    remaining = _remove(remaining, card.get_value())
+                cells.append((total, has_ace, hand, remaining))
+        solver.prepare([(hand.hard_value, hand.num_aces > 0, remaining) for _, _, hand, remaining in cells])
+        for total, has_ace, hand, remaining in cells:
+            evs = solver.action_evs(hand, remaining)
+            action = table.action(total, has_ace, up_value)
+            best = max(evs, key=evs.get)
+            if action != best and evs[best] > evs[action]:
+                mistakes.append({
+                    "total": total,
+                    "has_ace": has_ace,
+                    "dealer_up": up_value,
+                    "action": action,
+                    "best": best,
+                    "ev_loss": evs[best] - evs[action],
+                })
+    mistakes.sort(key=lambda cell: cell["ev_loss"], reverse=True)
+    return mistakes
@@ -1,63 +1,159 @@
-from typing import List, Dict
+import random
+import time
+from typing import List, Dict, Optional
 from ..models.deck import Deck
 from ..models.player import Player
 from ..models.dealer import Dealer
 from ..models.card import Card
-from ..agents.dealer_agent import DealerAgent
+from .event_log import BET, DEAL, ACTION, RESULT, PAYOUT, DEALER_SEAT, RESULT_CODES
 
 class GameEngine:
-    def __init__(self, use_ai_dealer: bool = True):
-        self.deck = Deck()
+    def __init__(self, use_ai_dealer: bool = True, rng: Optional[random.Random] = None,
+                 dealer: Optional[Dealer] = None, event_sink=None,
+                 num_decks: int = 1, penetration: float = 0.75, tracer=None):
+        self.rng = rng  # None shuffles with the global random module
+        self.tracer = tracer  # e.g. a PhaseTracer; None disables instrumentation
+        # The shoe is built once; a cut card at `penetration` triggers an in-place reshuffle
+        self.deck = Deck(rng=rng, num_decks=num_decks, penetration=penetration)
+        self.deck.shuffle()
         self.players: List[Player] = []
-        self.dealer = DealerAgent() if use_ai_dealer else Dealer()
+        self.event_sink = event_sink  # e.g. an EventLog; None records nothing
+        self.round_number = 0
+        self.bets: Dict[str, int] = {}  # Bets placed in the last round
+        if dealer is not None:
+            self.dealer = dealer
+        elif use_ai_dealer:
+            # Imported here so local-only tables never load the LLM stack
+            from ..agents.dealer_agent import DealerAgent
+            self.dealer = DealerAgent()
+        else:
+            self.dealer = Dealer()
         
     def add_player(self, player: Player):
         """Add a player to the game"""
         self.players.append(player)
+        player.shoe = self.deck.view
+    
+    def snapshot(self) -> Dict:
+        """
+        Engine state between rounds: round number, shoe (order, position and
+        RNG state), every seat's chips and the dealer's own state if it keeps
+        any (DealerAgent's shadow sampling). Restoring it into an engine with
+        the same players continues with the identical sequence of rounds.
+        """
+        state = {
+            "round_number": self.round_number,
+            "deck": self.deck.snapshot(),
+            "chips": [(player.name, player.chips) for player in self.players],
+            "dealer_chips": self.dealer.chips,
+        }
+        if hasattr(self.dealer, "snapshot"):
+            state["dealer"] = self.dealer.snapshot()
+        return state
+    
+    def restore(self, state: Dict):
+        """Return to a state taken with snapshot()"""
+        names = [name for name, _ in state["chips"]]
+        if names != [player.name for player in self.players]:
+            raise ValueError(f"Snapshot is for players {names}")
+        self.round_number = state["round_number"]
+        self.deck.restore(state["deck"])
+        for player, (_, chips) in zip(self.players, state["chips"]):
+            player.chips = chips
+        self.dealer.chips = state["dealer_chips"]
+        if "dealer" in state:
+            self.dealer.restore(state["dealer"])
         
     def start_round(self):
         """Start a new round of the game"""
+        self.round_number += 1
+        
         # Clear all hands
         for player in self.players:
-            player.hand.cards.clear()
-        self.dealer.hand.cards.clear()
+            player.hand.clear()
+        self.dealer.hand.clear()
         
-        # Shuffle deck if needed
-        if len(self.deck.cards) < (len(self.players) + 1) * 4:
-            self.deck = Deck()
-        self.deck.shuffle()
+        # Reshuffle once the cut card is out or the shoe runs low
+        if self.deck.needs_reshuffle() or len(self.deck) < (len(self.players) + 1) * 4:
+            self.deck.reshuffle()
+        self.deck.shoe.mark()
         
-        # Deal initial cards
-        for _ in range(2):
+        # Deal initial cards; the dealer's second card is the hole card,
+        # kept out of the count until the dealer turns it over
+        for i in range(2):
             for player in self.players:
-                player.hand.add_card(self.deck.draw_card())
-            self.dealer.hand.add_card(self.deck.draw_card())
+                player.hand.add_card(self._draw_card())
+            self.dealer.hand.add_card(self._draw_card() if i == 0 else self.deck.draw_hidden_card())
+        
+        if self.event_sink is not None:
+            for seat, player in enumerate(self.players):
+                for card in player.hand.cards:
+                    self.event_sink.record(self.round_number, seat, DEAL, card.code)
+            for card in self.dealer.hand.cards:
+                self.event_sink.record(self.round_number, DEALER_SEAT, DEAL, card.code)
+    
+    def _draw_card(self) -> Card:
+        """Draw a card, reshuffling the discards back in if the shoe runs out mid-round"""
+        if not len(self.deck):
+            self.deck.reshuffle(card for player in self.players + [self.dealer] for card in player.hand.cards)
+        return self.deck.draw_card()
+    
+    def _draw_dealer_card(self) -> Card:
+        """Draw a card for the dealer's hits; subclasses can deal these from elsewhere"""
+        return self._draw_card()
     
     def player_hit(self, player: Player) -> bool:
         """
         Give the player another card
         Returns True if player busts, False otherwise
         """
-        player.hand.add_card(self.deck.draw_card())
+        card = self._draw_card()
+        player.hand.add_card(card)
+        if self.event_sink is not None:
+            self.event_sink.record(self.round_number, self.players.index(player), DEAL, card.code)
         return player.hand.is_bust()
 
     def _handle_bets(self, verbose: bool = False) -> Dict[str, int]:
         """Handle betting phase for all players"""
+        return self._place_bets([player.decide_bet() for player in self.players], verbose)
+    
+    def _place_bets(self, decisions: List[int], verbose: bool = False) -> Dict[str, int]:
+        """Place every player's decided bet; returns the bets that were covered"""
         bets = {}
-        for player in self.players:
-            bet = player.decide_bet()
+        for player, bet in zip(self.players, decisions):
             if player.place_bet(bet):
                 bets[player.name] = bet
+                self._record_bet(player, bet)
                 if verbose:
                     print(f"{player.name} bets {bet} chips")
             else:
                 if verbose:
                     print(f"{player.name} cannot bet {bet} chips (not enough chips)")
         return bets
+    
+    def _record_bet(self, player: Player, bet: int):
+        if self.event_sink is not None:
+            self.event_sink.record(self.round_number, self.players.index(player), BET, bet)
+    
+    def _record_action(self, player: Player, action: str):
+        if self.event_sink is not None:
+            self.event_sink.record(self.round_number, self.players.index(player), ACTION, ord(action))
+    
+    def _record_dealer_card(self):
+        if self.event_sink is not None:
+            self.event_sink.record(self.round_number, DEALER_SEAT, DEAL, self.dealer.hand.cards[-1].code)
+    
+    def _record_result(self, player: Player, result: str, delta: int):
+        if self.event_sink is not None:
+            seat = self.players.index(player)
+            self.event_sink.record(self.round_number, seat, RESULT, RESULT_CODES[result])
+            self.event_sink.record(self.round_number, seat, PAYOUT, delta)
 
     def _settle_bets(self, results: Dict[str, str], bets: Dict[str, int], verbose: bool = False):
         """Settle all bets based on game results"""
         for player in self.players:
+            if player.name not in bets:  # Sat out this round
+                continue
             result = results[player.name]
             bet = bets[player.name]
             
@@ -66,15 +162,18 @@ class GameEngine:
                 win_amount = int(bet * multiplier)
                 player.win_bet(multiplier)
                 self.dealer.chips -= win_amount
+                self._record_result(player, result, win_amount)
                 if verbose:
                     print(f"{player.name} wins {win_amount} chips")
             elif result == 'LOSE' or result == 'BUST':
                 player.lose_bet()
                 self.dealer.chips += bet
+                self._record_result(player, result, -bet)
                 if verbose:
                     print(f"{player.name} loses {bet} chips")
             else:  # PUSH
                 player.push_bet()
+                self._record_result(player, result, 0)
                 if verbose:
                     print(f"{player.name} gets their bet back")
 
@@ -83,57 +182,110 @@ class GameEngine:
         Play a complete round with all players
         Returns: Dictionary mapping player names to their results
         """
-        results = {}
+        tracer = self.tracer
+        phase_start = time.perf_counter() if tracer is not None else 0.0
         
         # Betting phase
-        bets = self._handle_bets(verbose)
-        if verbose:
-            print("\nBetting phase complete")
+        bets = self.bets = self._handle_bets(verbose)
+        phase_start = self._end_bets(phase_start, verbose)
         
         # Players' turns
         for player in self.players:
-            if verbose:
-                print(f"\n{player.name}'s turn:")
-                print(f"Initial hand: {', '.join(str(card) for card in player.hand.cards)}")
-            
-            # Player's turn
+            self._start_turn(player, verbose)
             while True:
+                decision_start = time.perf_counter() if tracer is not None else 0.0
                 action = player.decide_action(self.dealer.hand.cards[0])
-                if verbose:
-                    print(f"{player.name} decides to: {'Hit' if action == 'H' else 'Stand'}")
-                
-                if action == 'S':
+                if self._apply_action(player, action, decision_start, verbose):
                     break
-                if action == 'H':
-                    bust = self.player_hit(player)
-                    if verbose:
-                        print(f"New hand: {', '.join(str(card) for card in player.hand.cards)}")
-                    if bust:
-                        if verbose:
-                            print("Bust!")
-                        break
         
         # Dealer's turn
-        if verbose:
-            print("\nDealer's turn:")
+        phase_start = self._start_dealer_turn(phase_start, verbose)
         while self.dealer.should_hit():
-            self.dealer.hand.add_card(self.deck.draw_card())
-            if verbose:
-                print(f"Dealer's hand: {', '.join(str(card) for card in self.dealer.hand.cards)}")
+            self._dealer_hit(verbose)
+        
+        return self._finish_round(bets, phase_start, verbose)
+    
+    # Steps of play_round, shared with AsyncGameEngine, which only changes how
+    # the bet, action and dealer decisions between them are obtained
+    
+    def _end_bets(self, phase_start: float, verbose: bool) -> float:
+        if verbose:
+            print("\nBetting phase complete")
+        return self._end_phase("bets", phase_start)
+    
+    def _start_turn(self, player: Player, verbose: bool):
+        if verbose:
+            print(f"\n{player.name}'s turn:")
+            print(f"Initial hand: {', '.join(str(card) for card in player.hand.cards)}")
+    
+    def _apply_action(self, player: Player, action: str, decision_start: float, verbose: bool) -> bool:
+        """
+        Carry out a player's decision, timed from decision_start
+        Returns: True once the player's turn is over (stand or bust)
+        """
+        if self.tracer is not None:
+            self.tracer.record_decision(player, time.perf_counter() - decision_start)
+        self._record_action(player, action)
+        if verbose:
+            print(f"{player.name} decides to: {'Hit' if action == 'H' else 'Stand'}")
         
-        # Get results and settle bets
+        if action == 'S':
+            return True
+        if action == 'H':
+            bust = self.player_hit(player)
+            if verbose:
+                print(f"New hand: {', '.join(str(card) for card in player.hand.cards)}")
+            if bust:
+                if verbose:
+                    print("Bust!")
+                return True
+        return False
+    
+    def _start_dealer_turn(self, phase_start: float, verbose: bool) -> float:
+        """End the players' phase and turn the hole card over"""
+        phase_start = self._end_phase("players", phase_start)
+        if verbose:
+            print("\nDealer's turn:")
+        self.deck.reveal(self.dealer.hand.cards[1])
+        return phase_start
+    
+    def _dealer_hit(self, verbose: bool):
+        self.dealer.hand.add_card(self._draw_dealer_card())
+        self._record_dealer_card()
+        if verbose:
+            print(f"Dealer's hand: {', '.join(str(card) for card in self.dealer.hand.cards)}")
+    
+    def _finish_round(self, bets: Dict[str, int], phase_start: float, verbose: bool) -> Dict[str, str]:
+        """Get results and settle bets once the dealer stands"""
+        phase_start = self._end_phase("dealer", phase_start)
+        results = {}
         for player in self.players:
             results[player.name] = self._get_game_result(player)
             if verbose:
                 print(f"\n{player.name}'s result: {results[player.name]}")
         
         self._settle_bets(results, bets, verbose)
+        if self.tracer is not None:
+            self._end_phase("settle", phase_start)
+            self.tracer.collect_counters(self._counter_sources())
         if verbose:
             for player in self.players:
                 print(f"{player.name}'s remaining chips: {player.chips}")
             print(f"Dealer's remaining chips: {self.dealer.chips}")
         
         return results
+    
+    def _counter_sources(self) -> List:
+        """Everything the tracer collects LLM call and token counts from"""
+        return self.players + [self.dealer]
+    
+    def _end_phase(self, phase: str, phase_start: float) -> float:
+        """Record a phase's duration with the tracer, if any, and return the next phase's start"""
+        if self.tracer is None:
+            return phase_start
+        now = time.perf_counter()
+        self.tracer.record(phase, now - phase_start)
+        return now
             
     def _get_game_result(self, player: Player) -> str:
         """Determine the game result for a player"""
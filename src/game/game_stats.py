@@ -0,0 +1,50 @@
+from .stats_aggregator import StatsAggregator
+from .tracer import PhaseTracer
+# matplotlib is imported inside the plot functions, so workers and headless
+# runs that never plot don't pay for it
+
+class GameStats:
+    def __init__(self, max_samples: int = 1000):
+        # Memory stays bounded: at most max_samples chips points per player
+        self.aggregator = StatsAggregator(max_samples)
+    
+    def merge_shard(self, result: dict):
+        """Merge the stats returned by one simulation shard"""
+        self.aggregator.merge(result["stats"])
+    
+    def plot_chips_history(self, path: str = 'chips_history.png'):
+        import matplotlib.pyplot as plt
+        plt.figure(figsize=(15, 10))
+        
+        # Plot sampled chips history for each player
+        for name, stats in self.aggregator.players.items():
+            rounds = [round_num for round_num, _ in stats.samples]
+            chips = [chips for _, chips in stats.samples]
+            plt.plot(rounds, chips, label=name, marker='o')
+        
+        plt.title('Player Chips History')
+        plt.xlabel('Round Number')
+        plt.ylabel('Chips')
+        plt.legend()
+        plt.grid(True)
+        plt.savefig(path)
+        plt.close()
+
+def plot_phase_timings(tracer: PhaseTracer, path: str = 'phase_timings.png'):
+    import matplotlib.pyplot as plt
+    import numpy as np
+    histograms = tracer.histograms()
+    plt.figure(figsize=(15, 10))
+    
+    # One line per phase / agent type over log2-microsecond buckets
+    for label, buckets in histograms:
+        plt.plot(np.arange(len(buckets)), buckets, label=label, marker='o')
+    
+    plt.title('Phase Timing Histogram')
+    plt.xlabel('log2(duration in microseconds)')
+    plt.ylabel('Count')
+    plt.yscale('symlog')
+    plt.legend()
+    plt.grid(True)
+    plt.savefig(path)
+    plt.close()
@@ -0,0 +1,243 @@
+"""
+Successive-halving search over BasicPlayerAgent's betting and hit/stand
+parameters.
+
+    python -m src.game.optimizer --candidates 81 --min-rounds 2000 --eta 3 --report report.json
+
+Every rung plays each surviving candidate for more rounds across the process
+pool, then keeps the best 1/eta of them; the rounds per candidate grow by eta
+each rung, so most of the budget goes to the top candidates. All candidates
+in a rung play the same table seeds (common random numbers), which makes the
+comparison between them much less noisy than independent runs.
+
+The search runs in two stages, because the two kinds of parameters need
+different objectives. Hit/stand parameters are raced first, ranked by chips
+won per chip wagered, which bet size does not move. Bet sizing never changes
+the return per chip here (bets don't follow the cards), only how the
+bankroll grows or goes broke, so the betting parameters are raced second
+with the winning play parameters, ranked by the mean log of the final
+bankroll per session.
+"""
+import argparse
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+from .simulation_runner import play_shard
+from .stats_aggregator import PlayerStats
+from ..agents.basic_player_agent import BasicPlayerAgent
+from ..models.rng import derive_seed
+
+# Candidate values per BasicPlayerAgent parameter: a list is sampled from,
+# a (low, high) tuple of floats is sampled uniformly
+BET_SPACE: Dict[str, Any] = {
+    "low_chips": [250, 500, 750, 1000],
+    "high_chips": [1500, 2000, 3000, 4000],
+    "low_ratio": (0.01, 0.2),
+    "mid_ratio": (0.01, 0.25),
+    "high_ratio": (0.01, 0.3),
+}
+PLAY_SPACE: Dict[str, Any] = {
+    "soft_hit_max": [16, 17, 18],
+    "soft_hit_vs": [7, 8, 9, 10, 11],
+    "hard_hit_max": [10, 11, 12],
+    "hard_stand_min": [15, 16, 17, 18],
+    "dealer_weak_max": [5, 6, 7],
+}
+SEARCH_SPACE: Dict[str, Any] = {**BET_SPACE, **PLAY_SPACE}
+
+# What a stage ranks candidates by, and the units its score is printed in:
+# "play" is chips won per chip wagered, "bankroll" is the mean log of final
+# over starting chips per session
+OBJECTIVES = {"play": "per chip wagered", "bankroll": "log growth/session"}
+
+CANDIDATE_NAME = "Candidate"
+MIN_BET = 10  # BasicPlayerAgent's smallest bet; a session ending below it is ruined
+
+def default_params() -> Dict[str, Any]:
+    """The parameters BasicPlayerAgent uses out of the box"""
+    agent = BasicPlayerAgent()
+    return {name: getattr(agent, name) for name in SEARCH_SPACE}
+
+def sample_params(rng: random.Random, space: Dict[str, Any] = SEARCH_SPACE) -> Dict[str, Any]:
+    params = {}
+    for name, values in space.items():
+        if isinstance(values, tuple):
+            params[name] = round(rng.uniform(*values), 4)
+        else:
+            params[name] = rng.choice(values)
+    return params
+
+def make_candidate(params: Dict[str, Any]) -> List[BasicPlayerAgent]:
+    return [BasicPlayerAgent(CANDIDATE_NAME, **params)]
+
+class Candidate:
+    """One parameter set and the stats of every hand and session it has played"""
+    def __init__(self, candidate_id: int, params: Dict[str, Any], objective: str = "play"):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {objective}")
+        self.candidate_id = candidate_id
+        self.params = params
+        self.objective = objective
+        self.stats = PlayerStats(max_samples=1)  # Per hand
+        self.sessions = PlayerStats(max_samples=1)  # Per session, delta is the log bankroll growth
+        self.ruined = 0  # Sessions that ended below MIN_BET
+        self.rung = 0  # Last rung the candidate survived into
+    
+    def add_session(self, start_round: int, starting_chips: int, result: Dict):
+        """Fold in one play_shard result"""
+        self.stats.merge(result["stats"].players[CANDIDATE_NAME])
+        chips = result["final_chips"][CANDIDATE_NAME]
+        # A broke session counts as one chip left, so ruin is a large finite penalty
+        self.sessions.update(start_round, chips, math.log(max(chips, 1) / starting_chips))
+        if chips < MIN_BET:
+            self.ruined += 1
+    
+    @property
+    def score(self) -> float:
+        """Chips won per chip wagered, or mean log bankroll growth per session"""
+        if self.objective == "bankroll":
+            return self.sessions.mean
+        return self.stats.return_per_chip
+    
+    @property
+    def stderr(self) -> float:
+        """Standard error of score; per chip it takes the mean bet as fixed"""
+        if self.objective == "bankroll":
+            return self.sessions.stderr
+        if not self.stats.wagered:
+            return math.inf
+        return self.stats.stderr * self.stats.rounds / self.stats.wagered
+    
+    def report(self) -> Dict[str, Any]:
+        return {
+            "candidate_id": self.candidate_id,
+            "rung": self.rung,
+            "objective": self.objective,
+            "score": self.score,
+            "stderr": self.stderr,
+            "hands": self.stats.rounds,
+            "sessions": self.sessions.rounds,
+            "return_per_chip": self.stats.return_per_chip,
+            "log_growth": self.sessions.mean,
+            "ruin_rate": self.ruined / self.sessions.rounds if self.sessions.rounds else 0.0,
+            "mean_return": self.stats.mean,
+            "mean_bet": self.stats.wagered / self.stats.rounds if self.stats.rounds else 0.0,
+            "params": self.params,
+        }
+
+class SuccessiveHalving:
+    """
+    Races candidates in rungs: rung k plays every survivor for
+    min_rounds * eta**k more rounds, split into tables of session_rounds
+    rounds each starting from fresh chips, then keeps the top 1/eta by the
+    objective (see OBJECTIVES).
+    """
+    def __init__(self, candidates: List[Dict[str, Any]], min_rounds: int = 2000, eta: int = 3,
+                 session_rounds: int = 200, num_workers: Optional[int] = None, seed: int = 0,
+                 num_decks: int = 6, penetration: float = 0.75, objective: str = "play"):
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+        self.candidates = [Candidate(i, params, objective) for i, params in enumerate(candidates)]
+        self.objective = objective
+        self.min_rounds = min_rounds
+        self.eta = eta
+        self.session_rounds = session_rounds
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.seed = seed
+        self.num_decks = num_decks
+        self.penetration = penetration
+    
+    def _play_rung(self, executor: ProcessPoolExecutor, survivors: List[Candidate], rung: int):
+        rounds = self.min_rounds * self.eta ** rung
+        num_tables = max(1, rounds // self.session_rounds)
+        rung_seed = derive_seed(self.seed, rung)
+        # Round numbers stay distinct across tables and rungs so the stats merge cleanly
+        first_round = self.min_rounds * (self.eta ** rung - 1) // (self.eta - 1)
+        futures: List[Tuple[Candidate, int, Any]] = []
+        for candidate in survivors:
+            make_players = partial(make_candidate, candidate.params)
+            for table in range(num_tables):
+                start_round = first_round + table * self.session_rounds
+                futures.append((candidate, start_round, executor.submit(
+                    play_shard, table, start_round, self.session_rounds, rung_seed, make_players,
+                    max_samples=1, num_decks=self.num_decks, penetration=self.penetration,
+                )))
+        starting_chips = make_candidate({})[0].chips
+        for candidate, start_round, future in futures:
+            candidate.add_session(start_round, starting_chips, future.result())
+            candidate.rung = rung
+    
+    def run(self, verbose: bool = True) -> List[Dict[str, Any]]:
+        """
+        Race all candidates to the last rung
+        Returns: a report entry per candidate, best first; candidates dropped
+        earlier rank below those that survived longer
+        """
+        survivors = list(self.candidates)
+        rung = 0
+        with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+            while True:
+                self._play_rung(executor, survivors, rung)
+                survivors.sort(key=lambda candidate: candidate.score, reverse=True)
+                if verbose:
+                    best = survivors[0]
+                    print(f"Rung {rung}: {len(survivors)} candidates, best #{best.candidate_id} "
+                          f"{best.score:+.4f} ± {best.stderr:.4f} {OBJECTIVES[self.objective]} "
+                          f"over {best.stats.rounds} hands")
+                if len(survivors) <= 1:
+                    break
+                survivors = survivors[:max(1, len(survivors) // self.eta)]
+                rung += 1
+        
+        ranked = sorted(self.candidates, key=lambda candidate: (candidate.rung, candidate.score), reverse=True)
+        return [dict(rank=rank, **candidate.report()) for rank, candidate in enumerate(ranked, 1)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune BasicPlayerAgent parameters with successive halving")
+    parser.add_argument("--candidates", type=int, default=27, help="random parameter sets to race per stage")
+    parser.add_argument("--min-rounds", type=int, default=2000, help="rounds per candidate in the first rung")
+    parser.add_argument("--eta", type=int, default=3, help="keep 1/eta of the candidates per rung")
+    parser.add_argument("--session-rounds", type=int, default=200, help="rounds per table from fresh chips")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--num-decks", type=int, default=6)
+    parser.add_argument("--report", help="write the ranked report to this JSON file")
+    parser.add_argument("--top", type=int, default=10, help="candidates to print")
+    args = parser.parse_args()
+    
+    # The current defaults always race, so the report shows whether tuning helped
+    rng = random.Random(args.seed)
+    defaults = default_params()
+    
+    def race(stage: str, objective: str, base: Dict[str, Any], space: Dict[str, Any]) -> List[Dict[str, Any]]:
+        print(f"\n=== {stage} parameters ===")
+        candidates = [base] + [{**base, **sample_params(rng, space)} for _ in range(args.candidates - 1)]
+        search = SuccessiveHalving(candidates, min_rounds=args.min_rounds, eta=args.eta,
+                                   session_rounds=args.session_rounds, num_workers=args.workers,
+                                   seed=args.seed, num_decks=args.num_decks, objective=objective)
+        report = search.run()
+        print(f"\n=== {stage} ranking ===")
+        for entry in report[:args.top]:
+            label = " (defaults)" if entry["candidate_id"] == 0 else ""
+            print(f"#{entry['rank']:<3} rung {entry['rung']}  {entry['score']:+.4f} ± {entry['stderr']:.4f} "
+                  f"{OBJECTIVES[objective]} ({entry['mean_return']:+.2f} chips/hand at mean bet "
+                  f"{entry['mean_bet']:.1f}, ruin {entry['ruin_rate']:.1%}) over {entry['hands']} hands{label}")
+            print(f"     {({name: entry['params'][name] for name in space})}")
+        return report
+    
+    # Play first at the default betting, then betting on top of the winning play
+    play_report = race("Play", "play", defaults, PLAY_SPACE)
+    best_play = {name: play_report[0]["params"][name] for name in PLAY_SPACE}
+    bet_report = race("Betting", "bankroll", {**defaults, **best_play}, BET_SPACE)
+    
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"play": play_report, "betting": bet_report}, f, indent=2)
+        print(f"\nReport written to {args.report}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import copy
+import hashlib
+import json
+import os
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+from ..agents.basic_player_agent import BasicPlayerAgent
+from ..agents.counting_player_agent import CountingPlayerAgent
+from ..agents.table_agent import TableAgent
+from ..agents.llm_replay import LATENCY_MODES
+from ..models.player import Player
+from ..models.dealer import Dealer
+
+# Every key a run config may set, with its default
+DEFAULTS: Dict[str, Any] = {
+    "rounds": 40,  # Total rounds over all tables
+    "tables": None,  # Independent tables (shards); None means one per worker
+    "workers": None,  # Worker processes; None means one per CPU
+    "seed": 0,  # Run seed, every table derives its own stream from it
+    "num_decks": 1,
+    "penetration": 0.75,
+    "players": [
+        {"type": "basic", "name": "Basic Strategy Player"},
+    ],
+    "dealer": {"type": "house"},
+    "llm": {
+        "base_url": "",
+        "api_key": "",
+        "api_key_env": None,  # Read the key from this environment variable instead
+        "requests_per_second": 5,
+        "max_concurrency": 4,
+        "record": None,  # Call store file every request and response is written to
+        "replay": None,  # Call store file to answer from instead of the endpoint
+        "replay_latency": "none",  # "none", "recorded" or "sampled"
+    },
+    "output": {
+        "dir": "runs/default",
+        "summary": True,  # summary.json with per-player stats
+        "event_log": False,  # events/shard_NNNNN.bin per table
+        "plot": False,  # chips_history.png
+    },
+    "checkpoint": True,  # Save every finished table so the run can be resumed
+    "snapshot_every": 1000,  # Rounds between snapshots of unfinished tables, 0 for none
+    "progress_every": 1000,  # Rounds between progress reports from each playing table, 0 for none
+    "max_samples": 1000,  # Chips history points kept per player
+}
+
+PLAYER_TYPES = ("basic", "counting", "table", "gpt")
+DEALER_TYPES = ("house", "rule", "llm")
+
+# Keys that change what a run computes; output and worker settings don't
+_RESULT_KEYS = ("rounds", "tables", "seed", "num_decks", "penetration", "players", "dealer", "max_samples")
+
+def _merge(defaults: Dict[str, Any], overrides: Dict[str, Any], where: str = "config") -> Dict[str, Any]:
+    merged = copy.deepcopy(defaults)
+    for key, value in overrides.items():
+        if key not in defaults:
+            raise ValueError(f"Unknown key in {where}: {key}")
+        # Sections merge key by key; the dealer spec is replaced as a whole
+        if isinstance(defaults[key], dict) and key != "dealer":
+            merged[key] = _merge(defaults[key], value, f"{where}.{key}")
+        else:
+            merged[key] = value
+    return merged
+
+class RunConfig:
+    """
+    Settings for a headless run, loaded from a JSON file. Missing keys take
+    their DEFAULTS value; unknown keys are an error so typos don't silently
+    run the default.
+    """
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        self.settings = _merge(DEFAULTS, settings or {})
+        # Resolve the defaults that depend on the machine, so the table count
+        # (and with it every table's seed) is part of the fingerprint
+        self.settings["workers"] = self.settings["workers"] or os.cpu_count() or 1
+        self.settings["tables"] = self.settings["tables"] or self.settings["workers"]
+        self._validate()
+    
+    @classmethod
+    def from_file(cls, path: str) -> "RunConfig":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+    
+    def __getitem__(self, key: str) -> Any:
+        return self.settings[key]
+    
+    def _validate(self):
+        if not self["players"]:
+            raise ValueError("Config needs at least one player")
+        names = set()
+        for spec in self["players"]:
+            if spec.get("type") not in PLAYER_TYPES:
+                raise ValueError(f"Unknown player type: {spec.get('type')}")
+            if spec["type"] == "table" and "path" not in spec:
+                raise ValueError("Table players need a strategy table path")
+            name = player_name(spec)
+            if name in names:
+                raise ValueError(f"Duplicate player name: {name}")
+            names.add(name)
+        if self["dealer"].get("type") not in DEALER_TYPES:
+            raise ValueError(f"Unknown dealer type: {self['dealer'].get('type')}")
+        if self["llm"]["replay_latency"] not in LATENCY_MODES:
+            raise ValueError(f"Unknown replay latency mode: {self['llm']['replay_latency']}")
+    
+    def fingerprint(self) -> str:
+        """Hash of the settings that determine the results, to guard resumes"""
+        relevant = {key: self.settings[key] for key in _RESULT_KEYS}
+        return hashlib.blake2b(json.dumps(relevant, sort_keys=True).encode(), digest_size=16).hexdigest()
+    
+    def output_path(self, *parts: str) -> str:
+        return os.path.join(self["output"]["dir"], *parts)
+    
+    def make_players(self) -> Callable[[], List[Player]]:
+        """Picklable factory for the players of one table"""
+        return partial(build_players, self["players"], self["llm"])
+    
+    def make_dealer(self) -> Callable[[], Dealer]:
+        """Picklable factory for the dealer of one table"""
+        return partial(build_dealer, self["dealer"], self["llm"])
+
+def player_name(spec: Dict[str, Any]) -> str:
+    if "name" in spec:
+        return spec["name"]
+    if spec["type"] == "gpt":
+        return f"{spec.get('style', 'aggressive').capitalize()} AI Player"
+    return {"basic": "Basic Strategy Player", "counting": "Counting Player"}.get(spec["type"], "Table Player")
+
+def _configure_client(llm: Dict[str, Any]):
+    # Imported here so configs without LLM agents never load openai
+    from ..agents.llm_client import get_client
+    api_key = os.environ.get(llm["api_key_env"], "") if llm["api_key_env"] else llm["api_key"]
+    return get_client(llm["base_url"], api_key, requests_per_second=llm["requests_per_second"],
+                      burst=llm["max_concurrency"], max_concurrency=llm["max_concurrency"],
+                      record=llm["record"], replay=llm["replay"], replay_latency=llm["replay_latency"])
+
+def build_players(specs: List[Dict[str, Any]], llm: Dict[str, Any]) -> List[Player]:
+    """Create one table's players from their config specs"""
+    players = []
+    for spec in specs:
+        name = player_name(spec)
+        if spec["type"] == "basic":
+            players.append(BasicPlayerAgent(name))
+        elif spec["type"] == "counting":
+            players.append(CountingPlayerAgent(name, max_units=spec.get("max_units", 4)))
+        elif spec["type"] == "table":
+            players.append(TableAgent.from_file(spec["path"], name))
+        else:
+            from ..agents.gpt_player_agent import GPTPlayerAgent
+            players.append(GPTPlayerAgent(name, style=spec.get("style", "aggressive"),
+                                          client=_configure_client(llm)))
+    return players
+
+def build_dealer(spec: Dict[str, Any], llm: Dict[str, Any]) -> Dealer:
+    """
+    Create one table's dealer: "house" is the plain dealer rule, "rule" the
+    DealerAgent in rule mode (with optional shadow_rate checks against GPT),
+    "llm" asks GPT for every decision
+    """
+    if spec["type"] == "house":
+        return Dealer()
+    from ..agents.dealer_agent import DealerAgent
+    return DealerAgent(client=_configure_client(llm), mode=spec["type"],
+                       shadow_rate=spec.get("shadow_rate", 0.0), seed=spec.get("seed"))
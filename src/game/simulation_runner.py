@@ -0,0 +1,226 @@
+import os
+import queue
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import ExitStack
+from multiprocessing import Manager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from .game_engine import GameEngine
+from .event_log import EventLog
+from .checkpoint import save_snapshot, load_snapshot
+from .stats_aggregator import StatsAggregator
+from .tracer import PhaseTracer
+from ..models.player import Player
+from ..models.dealer import Dealer
+from ..models.rng import make_rng
+
+def play_shard(shard_id: int, start_round: int, num_rounds: int, seed: int,
+               make_players: Callable[[], List[Player]], use_ai_dealer: bool = False,
+               make_dealer: Optional[Callable[[], Dealer]] = None, max_samples: int = 1000,
+               trace: bool = False, num_decks: int = 1, penetration: float = 0.75,
+               event_log: Optional[str] = None, snapshot: Optional[str] = None,
+               snapshot_every: int = 0, progress: Optional[Any] = None, progress_every: int = 1000) -> Dict:
+    """
+    Play num_rounds rounds on one table inside a worker process.
+    Stats are kept locally in a StatsAggregator and returned in one piece
+    for the parent to merge. event_log is a path to stream the shard's
+    round events to.
+    With a snapshot path, engine, stats and tracer state are saved there every
+    snapshot_every rounds and once the shard is done; a shard restarted with
+    the same arguments picks up from the last snapshot and produces exactly
+    the result of an uninterrupted run.
+    progress is a queue (e.g. from a multiprocessing Manager) that gets
+    (shard_id, rounds_done) every progress_every rounds, so the parent can
+    report on tables while they play.
+    """
+    key = (seed, shard_id, start_round, num_rounds)
+    saved = load_snapshot(snapshot) if snapshot is not None else None
+    if saved is not None:
+        if saved["key"] != key:
+            raise ValueError(f"Snapshot {snapshot} belongs to another run: {saved['key']}")
+        if "result" in saved:
+            return saved["result"]
+    
+    dealer = make_dealer() if make_dealer is not None else None
+    tracer = PhaseTracer() if trace else None
+    if tracer is not None and saved is not None:
+        tracer = saved["trace"]
+    sink = None
+    if event_log is not None:
+        if saved is not None:
+            # Drop events written after the snapshot, they are about to be replayed
+            os.truncate(event_log, saved["event_bytes"])
+        sink = EventLog(event_log, table_id=shard_id, append=saved is not None)
+    game = GameEngine(use_ai_dealer=use_ai_dealer, rng=make_rng(seed, shard_id), dealer=dealer,
+                      event_sink=sink, num_decks=num_decks, penetration=penetration, tracer=tracer)
+    players = make_players()
+    for player in players:
+        game.add_player(player)
+    
+    stats = StatsAggregator(max_samples)
+    first_round = 0
+    if saved is not None:
+        game.restore(saved["engine"])
+        stats = saved["stats"]
+        first_round = saved["rounds_done"]
+    
+    for round_num in range(first_round, num_rounds):
+        global_round = start_round + round_num
+        chips_before = [player.chips for player in players]
+        dealer_before = game.dealer.chips
+        
+        game.start_round()
+        results = game.play_round(verbose=False)
+        
+        for player, before in zip(players, chips_before):
+            if player.name in game.bets:
+                result = results[player.name]
+                blackjack = result == "WIN" and player.hand.is_blackjack()
+                stats.update(player.name, global_round, player.chips, player.chips - before, result, blackjack,
+                             game.bets[player.name])
+            else:
+                stats.update(player.name, global_round, player.chips)
+        stats.update("Dealer", global_round, game.dealer.chips, game.dealer.chips - dealer_before)
+        if progress is not None and (round_num + 1) % progress_every == 0:
+            progress.put((shard_id, round_num + 1))
+        
+        if snapshot_every and snapshot is not None and (round_num + 1) % snapshot_every == 0:
+            if sink is not None:
+                sink.flush()
+            save_snapshot(snapshot, {
+                "key": key,
+                "rounds_done": round_num + 1,
+                "engine": game.snapshot(),
+                "stats": stats,
+                "trace": tracer,
+                "event_bytes": sink.tell() if sink is not None else 0,
+            })
+    if sink is not None:
+        sink.close()
+    
+    result = {
+        "shard_id": shard_id,
+        "start_round": start_round,
+        "stats": stats,
+        "final_chips": {player.name: player.chips for player in players},
+        "dealer_chips": game.dealer.chips,
+    }
+    if tracer is not None:
+        result["trace"] = tracer
+    if hasattr(game.dealer, "shadow_stats"):
+        result["dealer_shadow"] = game.dealer.shadow_stats()
+    if snapshot is not None:
+        save_snapshot(snapshot, {"key": key, "result": result})
+    return result
+
+class SimulationRunner:
+    """
+    Shard rounds across a process pool. Every shard is an independent table
+    with its own seed derived from the run seed, so results are reproducible
+    for a given seed and shard count regardless of scheduling.
+    make_players and make_dealer must be picklable (e.g. module-level functions).
+    """
+    def __init__(self, make_players: Callable[[], List[Player]], num_workers: Optional[int] = None,
+                 seed: int = 0, use_ai_dealer: bool = False,
+                 make_dealer: Optional[Callable[[], Dealer]] = None, trace: bool = False,
+                 num_decks: int = 1, penetration: float = 0.75,
+                 event_log_dir: Optional[str] = None, snapshot_dir: Optional[str] = None,
+                 snapshot_every: int = 100, progress_every: int = 1000):
+        self.make_players = make_players
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.seed = seed
+        self.use_ai_dealer = use_ai_dealer
+        self.make_dealer = make_dealer
+        self.trace = trace  # Attach a PhaseTracer to every shard
+        self.num_decks = num_decks
+        self.penetration = penetration
+        self.event_log_dir = event_log_dir  # One shard_NNNNN.bin event log per shard
+        # One table_NNNNN.snap per shard, rerunning with the same settings resumes from them
+        self.snapshot_dir = snapshot_dir
+        self.snapshot_every = snapshot_every
+        self.progress_every = progress_every  # Rounds between on_progress calls per table
+    
+    def plan(self, total_rounds: int, num_shards: Optional[int] = None) -> List[Tuple[int, int, int]]:
+        """
+        Split total_rounds over num_shards tables (default: one per worker)
+        Returns: (shard_id, start_round, num_rounds) for every shard
+        """
+        num_shards = num_shards or self.num_workers
+        base, extra = divmod(total_rounds, num_shards)
+        shards = []
+        start_round = 0
+        for shard_id in range(num_shards):
+            num_rounds = base + (1 if shard_id < extra else 0)
+            shards.append((shard_id, start_round, num_rounds))
+            start_round += num_rounds
+        return shards
+    
+    def run(self, total_rounds: int, num_shards: Optional[int] = None,
+            skip: Iterable[int] = (), on_result: Optional[Callable[[Dict], None]] = None,
+            on_progress: Optional[Callable[[int, int], None]] = None) -> List[Dict]:
+        """
+        Play total_rounds rounds split over num_shards tables (default: one per worker).
+        Shards listed in skip (e.g. already checkpointed) are not played;
+        on_result is called in the parent as each shard finishes, and
+        on_progress(shard_id, rounds_done) every progress_every rounds of a
+        shard while it plays.
+        Returns: results of the shards played, ordered by shard id
+        """
+        skip = set(skip)
+        results = []
+        with ExitStack() as stack:
+            progress = None
+            if on_progress is not None:
+                progress = stack.enter_context(Manager()).Queue()
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=self.num_workers))
+            futures = {}
+            for shard_id, start_round, num_rounds in self.plan(total_rounds, num_shards):
+                if shard_id in skip:
+                    continue
+                event_log = None
+                if self.event_log_dir is not None:
+                    event_log = os.path.join(self.event_log_dir, f"shard_{shard_id:05d}.bin")
+                snapshot = None
+                if self.snapshot_dir is not None:
+                    snapshot = os.path.join(self.snapshot_dir, f"table_{shard_id:05d}.snap")
+                future = executor.submit(
+                    play_shard,
+                    shard_id,
+                    start_round,
+                    num_rounds,
+                    self.seed,
+                    self.make_players,
+                    self.use_ai_dealer,
+                    self.make_dealer,
+                    trace=self.trace,
+                    num_decks=self.num_decks,
+                    penetration=self.penetration,
+                    event_log=event_log,
+                    snapshot=snapshot,
+                    snapshot_every=self.snapshot_every,
+                    progress=progress,
+                    progress_every=self.progress_every,
+                )
+                futures[future] = shard_id
+            
+            pending = set(futures)
+            while pending:
+                # Wake up now and then to pass on progress from tables still playing
+                done, pending = wait(pending, timeout=0.5 if progress is not None else None,
+                                     return_when=FIRST_COMPLETED)
+                while progress is not None:
+                    try:
+                        on_progress(*progress.get_nowait())
+                    except queue.Empty:
+                        break
+                for future in done:
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Shard {futures[future]} execution error: {e}")
+                        continue
+                    results.append(result)
+                    if on_result is not None:
+                        on_result(result)
+        
+        results.sort(key=lambda result: result["shard_id"])
+        return results
@@ -0,0 +1,143 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+OUTCOME_NAMES = ("WIN", "LOSE", "PUSH", "BUST")
+
+class PlayerStats:
+    """
+    Running statistics for one seat in O(1) memory:
+    Welford mean/variance of the per-round chip delta, chips wagered,
+    outcome counts, peak chips and maximum drawdown, and a chips trajectory sampled at every
+    stride-th round, with the stride doubling whenever max_samples is exceeded.
+    """
+    def __init__(self, max_samples: int = 1000):
+        self.max_samples = max_samples
+        self.rounds = 0  # Rounds with a settled bet
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.wagered = 0  # Sum of the bets behind those rounds
+        self.outcomes: Dict[str, int] = {name: 0 for name in OUTCOME_NAMES}
+        self.blackjacks = 0
+        self.peak: Optional[int] = None
+        self.max_drawdown = 0
+        self.last_chips: Optional[int] = None
+        self.stride = 1
+        self.samples: List[Tuple[int, int]] = []  # (round number, chips)
+    
+    def update(self, round_number: int, chips: int, delta: Optional[int] = None,
+               result: Optional[str] = None, blackjack: bool = False, bet: int = 0):
+        """
+        Record the chips after a round; delta and result are None when the
+        seat had no bet this round
+        """
+        if delta is not None:
+            self.rounds += 1
+            self.wagered += bet
+            diff = delta - self.mean
+            self.mean += diff / self.rounds
+            self._m2 += diff * (delta - self.mean)
+        if result is not None:
+            self.outcomes[result] += 1
+            if blackjack:
+                self.blackjacks += 1
+        
+        if self.peak is None or chips > self.peak:
+            self.peak = chips
+        self.max_drawdown = max(self.max_drawdown, self.peak - chips)
+        self.last_chips = chips
+        
+        if round_number % self.stride == 0:
+            self.samples.append((round_number, chips))
+            if len(self.samples) > self.max_samples:
+                self._downsample(self.stride * 2)
+    
+    def _downsample(self, stride: int):
+        while True:
+            self.stride = stride
+            self.samples = [sample for sample in self.samples if sample[0] % stride == 0]
+            if len(self.samples) <= self.max_samples:
+                return
+            stride *= 2
+    
+    @property
+    def variance(self) -> float:
+        """Sample variance of the per-round chip delta"""
+        return self._m2 / (self.rounds - 1) if self.rounds > 1 else 0.0
+    
+    @property
+    def stderr(self) -> float:
+        """Standard error of the mean chip delta"""
+        return math.sqrt(self.variance / self.rounds) if self.rounds else math.inf
+    
+    @property
+    def return_per_chip(self) -> float:
+        """Chips won per chip wagered, independent of bet size"""
+        return self.mean * self.rounds / self.wagered if self.wagered else 0.0
+    
+    def merge(self, other: "PlayerStats"):
+        """
+        Fold in the stats of another table or shard. Moments, counts and the
+        sampled trajectory (keyed by global round number) merge exactly;
+        drawdown is the worst of the merged tables.
+        """
+        if other.rounds:
+            total = self.rounds + other.rounds
+            diff = other.mean - self.mean
+            self._m2 += other._m2 + diff * diff * self.rounds * other.rounds / total
+            self.mean += diff * other.rounds / total
+            self.rounds = total
+        self.wagered += other.wagered
+        for name, count in other.outcomes.items():
+            self.outcomes[name] += count
+        self.blackjacks += other.blackjacks
+        if other.peak is not None and (self.peak is None or other.peak > self.peak):
+            self.peak = other.peak
+        self.max_drawdown = max(self.max_drawdown, other.max_drawdown)
+        if other.last_chips is not None:
+            self.last_chips = other.last_chips
+        
+        stride = max(self.stride, other.stride)
+        self.samples = sorted(
+            sample for sample in self.samples + other.samples if sample[0] % stride == 0
+        )
+        self._downsample(stride)
+    
+    def summary(self) -> Dict[str, float]:
+        """Plain dict of the headline numbers"""
+        summary = {
+            "rounds": self.rounds,
+            "mean_return": self.mean,
+            "std_return": math.sqrt(self.variance),
+            "wagered": self.wagered,
+            "return_per_chip": self.return_per_chip,
+            "blackjacks": self.blackjacks,
+            "max_drawdown": self.max_drawdown,
+            "final_chips": self.last_chips,
+        }
+        summary.update(self.outcomes)
+        return summary
+
+class StatsAggregator:
+    """Memory-bounded per-seat statistics for a run; see PlayerStats"""
+    def __init__(self, max_samples: int = 1000):
+        self.max_samples = max_samples
+        self.players: Dict[str, PlayerStats] = {}
+    
+    def _stats(self, name: str) -> PlayerStats:
+        stats = self.players.get(name)
+        if stats is None:
+            stats = self.players[name] = PlayerStats(self.max_samples)
+        return stats
+    
+    def update(self, name: str, round_number: int, chips: int, delta: Optional[int] = None,
+               result: Optional[str] = None, blackjack: bool = False, bet: int = 0):
+        """Record one round for a seat"""
+        self._stats(name).update(round_number, chips, delta, result, blackjack, bet)
+    
+    def merge(self, other: "StatsAggregator"):
+        """Fold in another aggregator, e.g. one returned by a worker"""
+        for name, stats in other.players.items():
+            self._stats(name).merge(stats)
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {name: stats.summary() for name, stats in self.players.items()}
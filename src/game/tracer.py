@@ -0,0 +1,134 @@
+import math
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple
+
+# Histogram buckets: bucket i holds durations in [2**(i-1), 2**i) microseconds
+NUM_BUCKETS = 32
+
+class TimingHistogram:
+    """Count, total, min/max and a log2-microsecond histogram of durations"""
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets = [0] * NUM_BUCKETS
+    
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        micros = int(seconds * 1e6)
+        self.buckets[min(micros.bit_length(), NUM_BUCKETS - 1)] += 1
+    
+    def merge(self, other: "TimingHistogram"):
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+    
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "mean_us": self.total / self.count * 1e6 if self.count else 0.0,
+            "min_us": self.min * 1e6 if self.count else 0.0,
+            "max_us": self.max * 1e6,
+        }
+
+class PhaseTracer:
+    """
+    Opt-in instrumentation for GameEngine.play_round: timing histograms per
+    phase (bets, players, dealer, settle) and per agent type for decisions,
+    plus LLM call, fallback and token counts read from the agents. Attach it with
+    GameEngine(tracer=...); when no tracer is attached the engine only pays
+    a None check per phase.
+    """
+    def __init__(self):
+        self.phases: Dict[str, TimingHistogram] = {}
+        self.decisions: Dict[str, TimingHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        self._seen: Dict[int, Dict[str, int]] = {}
+    
+    def __getstate__(self):
+        # Agent ids mean nothing in another process; a tracer restored from a
+        # snapshot counts the new agents from zero
+        state = dict(self.__dict__)
+        state["_seen"] = {}
+        return state
+    
+    def record(self, phase: str, seconds: float):
+        """Add one timing for a phase"""
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = TimingHistogram()
+        histogram.add(seconds)
+    
+    def record_decision(self, agent, seconds: float):
+        """Add one decision timing for the agent's type"""
+        name = type(agent).__name__
+        histogram = self.decisions.get(name)
+        if histogram is None:
+            histogram = self.decisions[name] = TimingHistogram()
+        histogram.add(seconds)
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block as a phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+    
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def collect_counters(self, agents: Iterable):
+        """
+        Pick up LLM calls, fallbacks and token usage of agents (or anything
+        else counting llm_calls, like a BatchDispatcher) since the last collection
+        """
+        for agent in agents:
+            calls = getattr(agent, "llm_calls", None)
+            if calls is None:
+                continue
+            values = {"llm_calls": calls}
+            fallbacks = getattr(agent, "fallbacks", None)
+            if fallbacks is not None:
+                values["fallbacks"] = fallbacks
+            usage = getattr(agent, "usage", None)
+            if usage is not None:
+                values.update(usage.counts())
+            last = self._seen.get(id(agent), {})
+            self._seen[id(agent)] = values
+            name = type(agent).__name__
+            for key, value in values.items():
+                self.count(f"{name}.{key}", value - last.get(key, 0))
+    
+    def merge(self, other: "PhaseTracer"):
+        """Fold in a tracer from another table or worker"""
+        for mine, theirs in ((self.phases, other.phases), (self.decisions, other.decisions)):
+            for name, histogram in theirs.items():
+                if name not in mine:
+                    mine[name] = TimingHistogram()
+                mine[name].merge(histogram)
+        for name, value in other.counters.items():
+            self.count(name, value)
+    
+    def summary(self) -> Dict[str, Dict]:
+        return {
+            "phases": {name: h.summary() for name, h in self.phases.items()},
+            "decisions": {name: h.summary() for name, h in self.decisions.items()},
+            "counters": dict(self.counters),
+        }
+    
+    def histograms(self) -> List[Tuple[str, List[int]]]:
+        """(label, buckets) for every phase and agent type, for plotting"""
+        return ([(name, h.buckets) for name, h in self.phases.items()]
+                + [(f"decide {name}", h.buckets) for name, h in self.decisions.items()])
@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Tuple
 
 class Suit(Enum):
     HEARTS = "♥"
@@ -21,11 +22,22 @@ class Rank(Enum):
     QUEEN = 12
     KING = 13
 
+# Integer card encoding: code = suit_index * 13 + (rank.value - 1), so 0..51
+SUITS = tuple(Suit)
+RANKS = tuple(Rank)
+NUM_CODES = len(SUITS) * len(RANKS)
+_SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+
 class Card:
     def __init__(self, suit: Suit, rank: Rank):
         self.suit = suit
         self.rank = rank
     
+    @property
+    def code(self) -> int:
+        """Return the integer encoding of this card"""
+        return _SUIT_INDEX[self.suit] * 13 + self.rank.value - 1
+    
     def get_value(self) -> int:
         """Return the card's value in Blackjack"""
         if self.rank.value >= 10:
@@ -34,3 +46,12 @@ class Card:
     
     def __str__(self) -> str:
         return f"{self.rank.name} of {self.suit.value}"
+
+# Shared card objects and Blackjack values indexed by card code, so that
+# compact paths never have to allocate a Card or touch the enums
+CARDS: Tuple[Card, ...] = tuple(Card(suit, rank) for suit in SUITS for rank in RANKS)
+CARD_VALUES: Tuple[int, ...] = tuple(card.get_value() for card in CARDS)
+
+def card_from_code(code: int) -> Card:
+    """Return the shared Card view for an integer card code"""
+    return CARDS[code]
@@ -1,24 +1,59 @@
 import random
-from typing import List
-from .card import Card, Suit, Rank
+from typing import Dict, Iterable, List, Optional
+from .card import Card, CARDS
+from .shoe import Shoe, ShoeView
 
 class Deck:
-    def __init__(self):
-        self.cards: List[Card] = []
-        self._initialize_deck()
+    """Card-level view over a compact Shoe of one or more decks"""
+    def __init__(self, codes: Optional[Iterable[int]] = None, rng: Optional[random.Random] = None,
+                 num_decks: int = 1, penetration: float = 1.0):
+        self.shoe = Shoe(codes, rng, num_decks, penetration)
     
-    def _initialize_deck(self):
-        """Initialize a standard deck of 52 cards"""
-        self.cards = [Card(suit, rank) 
-                     for suit in Suit 
-                     for rank in Rank]
+    @property
+    def cards(self) -> List[Card]:
+        """Remaining cards, next card to be drawn first"""
+        return [CARDS[code] for code in self.shoe.remaining_codes()]
+    
+    def __len__(self) -> int:
+        return len(self.shoe)
     
     def shuffle(self):
         """Shuffle the deck"""
-        random.shuffle(self.cards)
+        self.shoe.shuffle()
+    
+    def needs_reshuffle(self) -> bool:
+        """Check if the cut card has been reached"""
+        return self.shoe.needs_reshuffle()
+    
+    def reshuffle(self, in_play: Iterable[Card] = ()):
+        """Shuffle all cards back into the deck, except the cards in play"""
+        self.shoe.reshuffle(card.code for card in in_play)
     
     def draw_card(self) -> Card:
         """Draw a card from the deck"""
-        if not self.cards:
-            raise ValueError("Deck is empty")
-        return self.cards.pop()
+        return self.shoe.draw_card()
+    
+    def draw_back_card(self) -> Card:
+        """Draw the last card of the deck"""
+        return CARDS[self.shoe.draw_back_code()]
+    
+    def draw_hidden_card(self) -> Card:
+        """Draw a face-down card, left out of the counts until reveal()"""
+        return CARDS[self.shoe.draw_hidden_code()]
+    
+    def reveal(self, card: Card):
+        """Turn a face-down card up"""
+        self.shoe.reveal(card.code)
+    
+    @property
+    def view(self) -> ShoeView:
+        """Read-only composition and count of the shoe"""
+        return self.shoe.view
+    
+    def snapshot(self) -> Dict:
+        """Serializable state of the shoe, see Shoe.snapshot()"""
+        return self.shoe.snapshot()
+    
+    def restore(self, state: Dict):
+        """Return to a state taken with snapshot()"""
+        self.shoe.restore(state)
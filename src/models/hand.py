@@ -2,33 +2,37 @@ from typing import List
 from .card import Card
 
 class Hand:
+    __slots__ = ('cards', 'hard_value', 'num_aces')
+    
     def __init__(self):
         self.cards: List[Card] = []
+        self.hard_value = 0  # Total with every ace counted as 1
+        self.num_aces = 0
     
     def add_card(self, card: Card):
         """Add a card to the hand"""
         self.cards.append(card)
+        value = card.get_value()
+        self.hard_value += value
+        if value == 1:  # Ace
+            self.num_aces += 1
+    
+    def clear(self):
+        """Remove all cards from the hand"""
+        self.cards.clear()
+        self.hard_value = 0
+        self.num_aces = 0
+    
+    def is_soft(self) -> bool:
+        """Check if an ace is currently counted as 11"""
+        return self.num_aces > 0 and self.hard_value <= 11
     
     def get_value(self) -> int:
         """Calculate the value of the hand"""
-        value = 0
-        num_aces = 0
-        
-        # First count non-aces
-        for card in self.cards:
-            if card.rank.value == 1:  # Ace
-                num_aces += 1
-            else:
-                value += card.get_value()
-        
-        # Then add aces
-        for _ in range(num_aces):
-            if value + 11 <= 21:
-                value += 11
-            else:
-                value += 1
-                
-        return value
+        # At most one ace can count as 11 without busting
+        if self.num_aces and self.hard_value <= 11:
+            return self.hard_value + 10
+        return self.hard_value
     
     def is_blackjack(self) -> bool:
         """Check if the hand is a blackjack"""
@@ -1,4 +1,6 @@
+from typing import Optional
 from .hand import Hand
+from .shoe import ShoeView
 
 class Player:
     def __init__(self, name: str, initial_chips: int = 1000):
@@ -6,6 +8,7 @@ class Player:
         self.hand = Hand()
         self.chips = initial_chips
         self.current_bet = 0
+        self.shoe: Optional[ShoeView] = None  # Set by the table the player joins
         
     def __str__(self) -> str:
         return self.name
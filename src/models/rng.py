@@ -0,0 +1,17 @@
+import hashlib
+import random
+
+def derive_seed(root_seed: int, *path: int) -> int:
+    """
+    Counter-based seed splitting: hash the root seed and a path of counters
+    (e.g. worker id, shoe number) into an independent 64-bit seed.
+    The same (root_seed, *path) always gives the same seed, and no stream
+    depends on how many values another stream has consumed.
+    """
+    key = ",".join(str(int(part)) for part in (root_seed,) + path)
+    digest = hashlib.blake2b(key.encode(), digest_size=8, person=b"21point").digest()
+    return int.from_bytes(digest, "little")
+
+def make_rng(root_seed: int, *path: int) -> random.Random:
+    """Return an independent random.Random stream for a seed path"""
+    return random.Random(derive_seed(root_seed, *path))
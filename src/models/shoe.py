@@ -0,0 +1,210 @@
+import random
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from .card import Card, CARDS, NUM_CODES, RANKS, Rank
+
+# Rank index (rank.value - 1) and Hi-Lo tag of every card code:
+# +1 for 2-6, 0 for 7-9, -1 for tens, faces and aces
+RANK_INDEX: Tuple[int, ...] = tuple(code % len(RANKS) for code in range(NUM_CODES))
+HI_LO: Tuple[int, ...] = tuple(
+    1 if 2 <= card.rank.value <= 6 else 0 if 7 <= card.rank.value <= 9 else -1 for card in CARDS
+)
+
+class Shoe:
+    """
+    Compact shoe: a preallocated array of integer card codes and a cursor.
+    Drawing advances the cursor instead of popping, so no Card objects are
+    created on the hot path. Cards can also be drawn off the back of the
+    shoe, which moves `end` down instead. Shuffling uses the injected rng, or the global
+    random module when none is given.
+    The cut card sits at `penetration` of the shoe; once the cursor passes it
+    needs_reshuffle() is true, and reshuffle() permutes the same buffer in place.
+    Per-rank counts of the unseen cards and the Hi-Lo running count of the
+    seen ones are kept up to date on every draw; `view` exposes them read-only.
+    """
+    def __init__(self, codes: Optional[Iterable[int]] = None, rng: Optional[random.Random] = None,
+                 num_decks: int = 1, penetration: float = 1.0):
+        if codes is None:
+            codes = list(range(NUM_CODES)) * num_decks
+        self.codes = array('b', codes)
+        self.cursor = 0
+        self.end = len(self.codes)  # One past the last undealt card
+        self.rng = rng if rng is not None else random
+        self.cut_card = int(len(self.codes) * penetration)
+        self._hidden: List[int] = []  # Drawn face down, not counted until revealed
+        self._recount()  # Sets rank_counts, running_count and the mark
+        self.view = ShoeView(self)
+    
+    def __len__(self) -> int:
+        """Number of cards left in the shoe"""
+        return self.end - self.cursor
+    
+    def shuffle(self):
+        """Shuffle the undealt cards in place"""
+        codes = self.codes
+        randbelow = self.rng.randrange
+        start = self.cursor
+        for i in range(self.end - 1, start, -1):
+            j = start + randbelow(i - start + 1)
+            codes[i], codes[j] = codes[j], codes[i]
+    
+    def needs_reshuffle(self) -> bool:
+        """Check if the cut card has come out"""
+        return self.cursor >= self.cut_card
+    
+    def reshuffle(self, in_play: Iterable[int] = ()):
+        """
+        Gather every card back into the shoe and shuffle it in place.
+        Codes in in_play (cards still on the table) are kept out of the new shoe.
+        """
+        codes = self.codes
+        cursor = 0
+        for code in in_play:
+            i = codes.index(code, cursor)
+            codes[cursor], codes[i] = codes[i], codes[cursor]
+            cursor += 1
+        self.cursor = cursor
+        self.end = len(codes)
+        self._hidden = [code for code in self._hidden if code in codes[:cursor]]
+        self.shuffle()
+        self._recount()
+    
+    def _recount(self):
+        """Rebuild the counts from scratch: every drawn card but the hidden ones is seen"""
+        counts = [0] * len(RANKS)
+        for code in self.codes[self.cursor:self.end]:
+            counts[RANK_INDEX[code]] += 1
+        for code in self._hidden:
+            counts[RANK_INDEX[code]] += 1
+        self.rank_counts = counts
+        self.running_count = (sum(HI_LO[code] for code in self.codes[:self.cursor])
+                              + sum(HI_LO[code] for code in self.codes[self.end:])
+                              - sum(HI_LO[code] for code in self._hidden))
+        self._mark = (self.running_count, self.unseen())
+    
+    def unseen(self) -> int:
+        """Number of cards the table has not seen: the undealt ones plus hidden ones"""
+        return self.end - self.cursor + len(self._hidden)
+    
+    def mark(self):
+        """Remember the current count, e.g. before a round's cards are dealt"""
+        self._mark = (self.running_count, self.unseen())
+    
+    def draw_code(self) -> int:
+        """Draw the next card as an integer code"""
+        if self.cursor >= self.end:
+            raise ValueError("Deck is empty")
+        code = self.codes[self.cursor]
+        self.cursor += 1
+        self.rank_counts[RANK_INDEX[code]] -= 1
+        self.running_count += HI_LO[code]
+        return code
+    
+    def draw_hidden_code(self) -> int:
+        """Draw the next card face down: it stays out of the counts until reveal()"""
+        if self.cursor >= self.end:
+            raise ValueError("Deck is empty")
+        code = self.codes[self.cursor]
+        self.cursor += 1
+        self._hidden.append(code)
+        return code
+    
+    def draw_back_code(self) -> int:
+        """Draw the last undealt card as an integer code"""
+        if self.cursor >= self.end:
+            raise ValueError("Deck is empty")
+        self.end -= 1
+        code = self.codes[self.end]
+        self.rank_counts[RANK_INDEX[code]] -= 1
+        self.running_count += HI_LO[code]
+        return code
+    
+    def reveal(self, code: int):
+        """Turn a hidden card face up and count it"""
+        if code in self._hidden:
+            self._hidden.remove(code)
+            self.rank_counts[RANK_INDEX[code]] -= 1
+            self.running_count += HI_LO[code]
+    
+    def draw_card(self) -> Card:
+        """Draw the next card as a shared Card view"""
+        return CARDS[self.draw_code()]
+    
+    def remaining_codes(self) -> array:
+        """Return the codes of the undealt cards, next card first"""
+        return self.codes[self.cursor:self.end]
+    
+    def snapshot(self) -> Dict:
+        """
+        Card order, cursor, end, cut card and RNG state; restoring it continues
+        the exact same sequence of draws and shuffles
+        """
+        return {
+            "codes": self.codes.tobytes(),
+            "cursor": self.cursor,
+            "end": self.end,
+            "cut_card": self.cut_card,
+            "rng": self.rng.getstate(),
+        }
+    
+    def restore(self, state: Dict):
+        """Return to a state taken with snapshot()"""
+        codes = array('b')
+        codes.frombytes(state["codes"])
+        self.codes = codes
+        self.cursor = state["cursor"]
+        self.end = state["end"]
+        self.cut_card = state["cut_card"]
+        self.rng.setstate(state["rng"])
+        self._hidden = []
+        self._recount()
+
+class ShoeView:
+    """
+    Read-only window on a Shoe's composition for agents: per-rank counts of
+    the cards not yet seen and the Hi-Lo running and true counts, all O(1)
+    to query. A hidden card (the dealer's hole card) is not counted until
+    it is turned over.
+    """
+    __slots__ = ("_shoe",)
+    
+    def __init__(self, shoe: Shoe):
+        self._shoe = shoe
+    
+    @property
+    def remaining(self) -> int:
+        """Cards not seen yet"""
+        return self._shoe.unseen()
+    
+    @property
+    def decks_remaining(self) -> float:
+        return self._shoe.unseen() / NUM_CODES
+    
+    @property
+    def running_count(self) -> int:
+        """Hi-Lo running count of the cards seen since the last shuffle"""
+        return self._shoe.running_count
+    
+    @property
+    def true_count(self) -> float:
+        """Running count per deck remaining"""
+        unseen = self._shoe.unseen()
+        return self._shoe.running_count * NUM_CODES / unseen if unseen else 0.0
+    
+    @property
+    def marked_true_count(self) -> float:
+        """
+        True count at the last Shoe.mark(); the engine marks before each deal,
+        so this is what a bet placed before the cards come out would see
+        """
+        running, unseen = self._shoe._mark
+        return running * NUM_CODES / unseen if unseen else 0.0
+    
+    @property
+    def rank_counts(self) -> Tuple[int, ...]:
+        """Unseen cards per rank, indexed by rank.value - 1"""
+        return tuple(self._shoe.rank_counts)
+    
+    def count(self, rank: Rank) -> int:
+        """Unseen cards of one rank"""
+        return self._shoe.rank_counts[rank.value - 1]